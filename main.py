@@ -6,14 +6,63 @@ Módulo principal de la aplicación Inicializador de Repositorios GitHub.
 Este archivo sirve como punto de entrada para la aplicación.
 """
 
+import os
 import sys
+import shutil
 import subprocess
-from PyQt5.QtWidgets import QApplication, QMessageBox, QPushButton, QDialog, QVBoxLayout, QLabel
-from PyQt5.QtCore import Qt, QEventLoop
-from src.views.main_window import MainWindow
+from functools import lru_cache
+from typing import Optional
+from PyQt5.QtWidgets import QApplication, QMessageBox, QPushButton, QDialog, QVBoxLayout, QLabel, QFrame
+from PyQt5.QtCore import Qt, QTimer
+from src.views.main_window import MainWindow, TaskThread
 from src.views.loading_screen import LoadingScreen
 from src.utils.common import is_git_installed
-from src.utils.github_cli import is_gh_cli_installed, is_gh_authenticated, get_gh_user_info, get_gh_cli_path
+from src.utils.github_cli import (
+    is_gh_cli_installed, is_gh_authenticated, get_gh_user_info, get_gh_cli_path, invalidate_gh_cache
+)
+
+
+# Hoja de estilos de la aplicación
+_STYLESHEET_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "views", "resources", "style.qss")
+
+# Instrucciones del diálogo de autenticación (antes y durante el proceso)
+_INSTRUCTIONS_HTML_INITIAL = (
+    "<html><body>"
+    "<p>Para utilizar esta aplicación, es necesario autenticarse en GitHub.</p>"
+    "<p>Al hacer clic en 'Iniciar autenticación', se abrirá el navegador web para que puedas iniciar sesión con tus credenciales de GitHub.</p>"
+    "<p>Sigue las instrucciones en el navegador y en la terminal para completar el proceso.</p>"
+    "</body></html>"
+)
+
+_INSTRUCTIONS_HTML_ACTIVE = (
+    "<html><body>"
+    "<h3>Instrucciones para la autenticación:</h3>"
+    "<p><b>1.</b> En la ventana de terminal que se abrirá:</p>"
+    "<ul>"
+    "<li>Selecciona <b>'HTTPS'</b> cuando te pregunte por el protocolo preferido.</li>"
+    "<li>Responde <b>'Y'</b> cuando te pregunte si deseas autenticar Git con tus credenciales de GitHub.</li>"
+    "<li>Copia el código de un solo uso que aparecerá y presiona Enter para abrir el navegador.</li>"
+    "<li>En el navegador, pega el código y autoriza la aplicación.</li>"
+    "</ul>"
+    "<p><b>2.</b> Una vez completado el proceso en la terminal y el navegador:</p>"
+    "<ul>"
+    "<li>Vuelve a esta ventana y haz clic en <b>'Verificar autenticación'</b>.</li>"
+    "<li>En Windows, la autenticación también se verifica automáticamente al cerrarse la consola.</li>"
+    "</ul>"
+    "<p style='color: #FF5722; font-weight: bold;'>Esta ventana permanecerá visible para que puedas consultar estas instrucciones en cualquier momento.</p>"
+    "</body></html>"
+)
+
+
+@lru_cache(maxsize=None)
+def _get_terminal_emulator() -> Optional[str]:
+    """
+    Obtiene la ruta del emulador de terminal del sistema (solo fuera de Windows).
+    
+    Returns:
+        Optional[str]: Ruta de 'x-terminal-emulator' o None si no se encuentra.
+    """
+    return shutil.which('x-terminal-emulator')
 
 
 class AuthDialog(QDialog):
@@ -27,21 +76,19 @@ class AuthDialog(QDialog):
         self.setMinimumWidth(500)
         # Permitir que el diálogo permanezca visible mientras se trabaja con otras ventanas
         self.setWindowFlags((self.windowFlags() & ~Qt.WindowContextHelpButtonHint) | Qt.WindowStaysOnTopHint)
-        # Asegurar que la ventana permanezca siempre visible, incluso cuando se abren otras ventanas
-        self.setWindowModality(Qt.NonModal)
         
         layout = QVBoxLayout()
         
         # Mensaje de instrucciones
-        info_label = QLabel(
-            "<html><body>"
-            "<p>Para utilizar esta aplicación, es necesario autenticarse en GitHub.</p>"
-            "<p>Al hacer clic en 'Iniciar autenticación', se abrirá el navegador web para que puedas iniciar sesión con tus credenciales de GitHub.</p>"
-            "<p>Sigue las instrucciones en el navegador y en la terminal para completar el proceso.</p>"
-            "</body></html>"
-        )
+        info_label = QLabel(_INSTRUCTIONS_HTML_INITIAL)
         info_label.setWordWrap(True)
-        layout.addWidget(info_label)
+        
+        # Contenedor del contenido variable del diálogo, para poder sustituirlo de una vez
+        self.info_container = QFrame()
+        container_layout = QVBoxLayout(self.info_container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        container_layout.addWidget(info_label)
+        layout.addWidget(self.info_container)
         
         # Botones
         button_layout = QVBoxLayout()
@@ -63,6 +110,13 @@ class AuthDialog(QDialog):
         
         layout.addLayout(button_layout)
         self.setLayout(layout)
+        
+        # Proceso de 'gh auth login' (solo en Windows), temporizador que detecta su finalización
+        # e hilo que verifica después la autenticación sin bloquear la interfaz
+        self.auth_process = None
+        self.auth_timer = QTimer(self)
+        self.auth_timer.timeout.connect(self._check_auth_process)
+        self.auth_check_thread = None
     
     def start_auth(self):
         """
@@ -72,62 +126,47 @@ class AuthDialog(QDialog):
         try:
             gh_path = get_gh_cli_path()
             if gh_path:
-                import os
-                
                 # Actualizamos la interfaz para indicar que el proceso está en curso
                 self.auth_button.setEnabled(False)
                 self.auth_button.setText("Autenticación en curso...")
-                self.retry_button.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold;")
+                # Destacar el botón de verificación (estilo definido en style.qss)
+                self.retry_button.setObjectName('primary')
+                self.retry_button.style().unpolish(self.retry_button)
+                self.retry_button.style().polish(self.retry_button)
                 
                 # Mostramos las instrucciones directamente en el diálogo en lugar de un mensaje emergente
                 # para que permanezcan visibles durante todo el proceso
-                info_label = QLabel(
-                    "<html><body>"
-                    "<h3>Instrucciones para la autenticación:</h3>"
-                    "<p><b>1.</b> En la ventana de terminal que se abrirá:</p>"
-                    "<ul>"
-                    "<li>Selecciona <b>'HTTPS'</b> cuando te pregunte por el protocolo preferido.</li>"
-                    "<li>Responde <b>'Y'</b> cuando te pregunte si deseas autenticar Git con tus credenciales de GitHub.</li>"
-                    "<li>Copia el código de un solo uso que aparecerá y presiona Enter para abrir el navegador.</li>"
-                    "<li>En el navegador, pega el código y autoriza la aplicación.</li>"
-                    "</ul>"
-                    "<p><b>2.</b> Una vez completado el proceso en la terminal y el navegador:</p>"
-                    "<ul>"
-                    "<li>Vuelve a esta ventana y haz clic en <b>'Verificar autenticación'</b>.</li>"
-                    "</ul>"
-                    "<p style='color: #FF5722; font-weight: bold;'>Esta ventana permanecerá visible para que puedas consultar estas instrucciones en cualquier momento.</p>"
-                    "</body></html>"
-                )
+                info_label = QLabel(_INSTRUCTIONS_HTML_ACTIVE)
                 info_label.setWordWrap(True)
-                info_label.setStyleSheet("background-color: #F5F5F5; padding: 10px; border-radius: 5px;")
-                
-                # Reemplazamos el contenido del layout con las nuevas instrucciones
-                # Primero, limpiamos el layout existente
-                for i in reversed(range(self.layout().count())):
-                    item = self.layout().itemAt(i)
-                    if item.layout() != self.layout().itemAt(self.layout().count()-1).layout():  # Preservamos el layout de botones
-                        widget = item.widget()
-                        if widget:
-                            widget.deleteLater()
+                info_label.setObjectName('instructions')
                 
-                # Añadimos las nuevas instrucciones al principio del layout
-                self.layout().insertWidget(0, info_label)
+                # Sustituimos el contenedor de instrucciones por uno nuevo; el layout de botones no se toca
+                new_container = QFrame()
+                container_layout = QVBoxLayout(new_container)
+                container_layout.setContentsMargins(0, 0, 0, 0)
+                container_layout.addWidget(info_label)
+                self.layout().replaceWidget(self.info_container, new_container)
+                self.info_container.deleteLater()
+                self.info_container = new_container
                 
                 # Ejecutamos el comando gh auth login de forma interactiva
                 try:
                     if os.name == 'nt':
-                        # En Windows, usamos start cmd.exe para abrir una nueva ventana de terminal
-                        # y ejecutar el comando de forma interactiva
-                        cmd = f'start cmd.exe /k \"{gh_path}\" auth login --web'
-                        subprocess.Popen(cmd, shell=True)
+                        # En Windows, abrimos una nueva consola para ejecutar el comando de forma interactiva.
+                        # El proceso es el propio gh, así que al terminar se verifica automáticamente
+                        self.auth_process = subprocess.Popen(
+                            [gh_path, 'auth', 'login', '--web'],
+                            creationflags=subprocess.CREATE_NEW_CONSOLE | subprocess.CREATE_NEW_PROCESS_GROUP
+                        )
+                        self.auth_timer.start(500)
                     else:
-                        # En otros sistemas operativos, abrimos una terminal
-                        import tempfile
-                        script_file = tempfile.NamedTemporaryFile(delete=False, suffix='.sh')
-                        script_file.write(f'{gh_path} auth login --web\necho "Presiona Enter para cerrar..."\nread'.encode())
-                        script_file.close()
-                        os.chmod(script_file.name, 0o755)
-                        subprocess.Popen(['x-terminal-emulator', '-e', script_file.name])
+                        # En otros sistemas operativos, abrimos una terminal. El emulador de terminal suele
+                        # terminar en cuanto abre la ventana, antes de completar el inicio de sesión, así
+                        # que aquí la verificación se hace con el botón 'Verificar autenticación'
+                        terminal = _get_terminal_emulator()
+                        if not terminal:
+                            raise FileNotFoundError("No se encontró 'x-terminal-emulator' para abrir una terminal.")
+                        subprocess.Popen([terminal, '-e', gh_path, 'auth', 'login', '--web'])
                 except Exception as cmd_error:
                     # Si falla el comando, mostramos el error
                     print(f"Error al ejecutar gh auth login: {cmd_error}")
@@ -148,12 +187,90 @@ class AuthDialog(QDialog):
             # Restauramos el estado del botón
             self.auth_button.setEnabled(True)
             self.auth_button.setText("Iniciar autenticación")
+    
+    def _check_auth_process(self):
+        """
+        Comprueba si el proceso de autenticación ha terminado.
+        Cuando termina, verifica la autenticación en segundo plano (la consulta a GitHub CLI puede
+        tardar varios segundos) y continúa en _auth_process_checked.
+        """
+        if self.auth_process is None or self.auth_process.poll() is None:
+            return
+        
+        self.auth_timer.stop()
+        # Descartar el estado anterior al inicio de sesión antes de volver a consultarlo
+        invalidate_gh_cache()
+        self.auth_check_thread = TaskThread(is_gh_authenticated)
+        self.auth_check_thread.finished_signal.connect(self._auth_process_checked)
+        self.auth_check_thread.error_signal.connect(self._auth_process_check_failed)
+        self.auth_check_thread.start()
+    
+    def _auth_process_checked(self, authenticated: bool):
+        """
+        Cierra el diálogo si la autenticación se completó correctamente o, si no, avisa al usuario.
+        La consola de 'gh auth login' se cierra al terminar, así que su mensaje de error ya no es visible.
+        
+        Args:
+            authenticated (bool): Resultado de la verificación de la autenticación.
+        """
+        if authenticated:
+            self.accept()
+            return
+        
+        QMessageBox.warning(
+            self,
+            "Autenticación no completada",
+            "El proceso de autenticación de GitHub CLI terminó, pero no se detectó ninguna sesión iniciada "
+            f"(código de salida: {self.auth_process.returncode}).\n\n"
+            "Puedes volver a intentarlo o, si completaste el inicio de sesión, pulsar 'Verificar autenticación'."
+        )
+        self.auth_button.setEnabled(True)
+        self.auth_button.setText("Iniciar autenticación")
+    
+    def _auth_process_check_failed(self, error_message: str):
+        """
+        Avisa al usuario de que no se pudo verificar automáticamente la autenticación.
+        
+        Args:
+            error_message (str): Mensaje del error producido.
+        """
+        QMessageBox.warning(
+            self,
+            "Error de autenticación",
+            f"No se pudo verificar la autenticación: {error_message}\n\n"
+            "Puedes comprobarla con el botón 'Verificar autenticación'."
+        )
+        self.auth_button.setEnabled(True)
+        self.auth_button.setText("Iniciar autenticación")
+    
+    def done(self, result: int):
+        """
+        Cierra el diálogo esperando antes a la verificación en segundo plano, si está en curso,
+        para que el hilo no se destruya mientras se ejecuta.
+        
+        Args:
+            result (int): Código de resultado del diálogo.
+        """
+        self.auth_timer.stop()
+        if self.auth_check_thread is not None and self.auth_check_thread.isRunning():
+            self.auth_check_thread.finished_signal.disconnect()
+            self.auth_check_thread.error_signal.disconnect()
+            self.auth_check_thread.wait()
+        super().done(result)
+    
+    def accept(self):
+        """
+        Cierra el diálogo para verificar de nuevo la autenticación.
+        Limpia la caché de GitHub CLI para que la siguiente verificación vuelva a consultarlo.
+        """
+        invalidate_gh_cache()
+        super().accept()
 
 
 def authenticate_github_cli():
     """
     Inicia el proceso de autenticación de GitHub CLI.
-    Muestra un diálogo con instrucciones y opciones para autenticarse.
+    Muestra un diálogo modal con instrucciones y opciones para autenticarse.
     El diálogo permanece visible mientras se realiza la autenticación en la terminal.
     
     Returns:
@@ -163,21 +280,11 @@ def authenticate_github_cli():
     if is_gh_authenticated():
         return True
     
-    # Crear y mostrar diálogo de autenticación no modal
+    # Crear el diálogo de autenticación; permanece encima de otras ventanas gracias a WindowStaysOnTopHint
     auth_dialog = AuthDialog()
-    auth_dialog.setModal(False)  # Hacemos que el diálogo no sea modal
-    auth_dialog.show()  # Mostramos el diálogo sin bloquear
-    auth_dialog.activateWindow()  # Aseguramos que tenga el foco
-    auth_dialog.raise_()  # Lo colocamos encima de otras ventanas
-    
-    # Creamos un bucle de eventos personalizado para esperar a que el diálogo se cierre
-    from PyQt5.QtCore import QEventLoop
-    loop = QEventLoop()
-    auth_dialog.accepted.connect(lambda: loop.exit(QDialog.Accepted))
-    auth_dialog.rejected.connect(lambda: loop.exit(QDialog.Rejected))
     
     # Esperamos a que el usuario complete la autenticación o cancele
-    result = loop.exec_()
+    result = auth_dialog.exec_()
     
     # Si el usuario cancela, salir
     if result == QDialog.Rejected:
@@ -187,6 +294,20 @@ def authenticate_github_cli():
     return is_gh_authenticated()
 
 
+def _load_stylesheet() -> str:
+    """
+    Lee la hoja de estilos de la aplicación.
+    
+    Returns:
+        str: Contenido de style.qss o una cadena vacía si no se puede leer.
+    """
+    try:
+        with open(_STYLESHEET_PATH, 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return ""
+
+
 def main():
     """
     Función principal que inicia la aplicación.
@@ -196,6 +317,9 @@ def main():
     app = QApplication(sys.argv)
     app.setApplicationName("Inicializador de Repositorios GitHub")
     
+    # Cargar la hoja de estilos de la aplicación una sola vez
+    app.setStyleSheet(_load_stylesheet())
+    
     # Definir las verificaciones iniciales
     checks = [
         {
@@ -227,10 +351,6 @@ def main():
     loading_screen = LoadingScreen(checks)
     # Mostrar la ventana sin bloquear para que aparezca inmediatamente
     loading_screen.show()
-    loading_screen.activateWindow()
-    loading_screen.raise_()
-    # Procesar eventos para asegurar que la interfaz se actualice inmediatamente
-    QApplication.processEvents()
     # Ejecutar el diálogo de forma modal
     result = loading_screen.exec_()
     
@@ -6,13 +6,109 @@ Módulo que contiene el controlador para operaciones Git.
 Implementa la lógica de negocio para interactuar con repositorios Git.
 """
 
+from __future__ import annotations
+
 import os
-from typing import List, Dict, Any, Optional, Callable, Tuple
+from typing import List, Dict, Any, Optional, Callable, Tuple, NamedTuple
 
 from src.models.git_repository import GitRepository
 from src.utils.common import format_git_url, validate_folder_path, get_default_branch_name
 
 
+class WorkflowStep(NamedTuple):
+    """
+    Paso de un flujo de trabajo: método de GitRepository a ejecutar y cómo interpretar su resultado.
+    """
+    name: str
+    function: Callable[..., tuple]
+    args: Tuple[Any, ...]
+    kwargs: Dict[str, Any]
+    result_handler: Callable[[tuple], Dict[str, Any]]
+    # Si es True, el paso se omite cuando un paso anterior indica que no hay cambios
+    skip_without_changes: bool = False
+
+
+def _standard_result(result: Tuple[bool, str]) -> Dict[str, Any]:
+    """
+    Convierte el resultado (éxito, mensaje) de un paso en un diccionario.
+    
+    Args:
+        result (Tuple[bool, str]): Resultado devuelto por el método de GitRepository.
+        
+    Returns:
+        Dict[str, Any]: Resultado del paso.
+    """
+    success, message = result
+    return {'success': success, 'message': message}
+
+
+def _remote_content_result(result: Tuple[bool, str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Convierte el resultado de check_remote_content en un diccionario, conservando la información del remoto.
+    
+    Args:
+        result (Tuple[bool, str, Dict[str, Any]]): Resultado devuelto por check_remote_content.
+        
+    Returns:
+        Dict[str, Any]: Resultado del paso.
+    """
+    success, message, remote_info = result
+    return {'success': success, 'message': message, 'remote_info': remote_info}
+
+
+def _changes_result(result: Tuple[bool, str, bool]) -> Dict[str, Any]:
+    """
+    Convierte el resultado de has_any_changes en un diccionario.
+    El paso es solo informativo, por lo que siempre se marca como éxito.
+    
+    Args:
+        result (Tuple[bool, str, bool]): Resultado devuelto por has_any_changes.
+        
+    Returns:
+        Dict[str, Any]: Resultado del paso.
+    """
+    _, message, has_changes = result
+    return {'success': True, 'message': message, 'has_changes': has_changes}
+
+
+# Especificación de los flujos de trabajo. Cada paso es una tupla con:
+# (nombre, método de GitRepository, claves de los argumentos variables, kwargs fijos,
+#  función que convierte el resultado del método en el diccionario de resultado,
+#  si el paso se omite cuando no hay cambios).
+# Los kwargs fijos se comparten entre flujos y no deben modificarse.
+# Los pasos se ejecutan en orden: cada uno depende del anterior y todos los que
+# escriben en el repositorio comparten el bloqueo del índice (.git/index.lock),
+# por lo que ejecutarlos de forma concurrente no es seguro.
+_NEW_WORKFLOW_SPEC = (
+    ('Inicializar repositorio Git', 'init_repository', (), {}, _standard_result, False),
+    ('Crear archivo .gitignore', 'create_gitignore', (), {'template': 'Python'}, _standard_result, False),
+    ('Añadir archivos al área de preparación', 'add_all_files', (), {}, _standard_result, True),
+    ('Realizar commit inicial', 'commit', ('commit_message',), {}, _standard_result, True),
+    ('Añadir repositorio remoto', 'add_remote', ('remote_url', 'remote_name'), {}, _standard_result, False),
+    ('Enviar cambios al repositorio remoto', 'push', ('remote_name', 'branch'), {}, _standard_result, False)
+)
+
+_EXISTING_WORKFLOW_SPEC = (
+    ('Inicializar repositorio Git', 'init_repository', (), {}, _standard_result, False),
+    ('Añadir repositorio remoto', 'add_remote', ('remote_url', 'remote_name'), {}, _standard_result, False),
+    ('Verificar contenido del repositorio remoto', 'check_remote_content', ('remote_name',), {},
+     _remote_content_result, False)
+)
+
+_OVERWRITE_WORKFLOW_SPEC = (
+    # Verificar si hay cambios en el repositorio antes de intentar hacer commit
+    ('Verificar cambios en el repositorio', 'has_any_changes', (), {}, _changes_result, False),
+    ('Añadir archivos al área de preparación', 'add_all_files', (), {}, _standard_result, True),
+    ('Realizar commit inicial', 'commit', ('commit_message',), {}, _standard_result, True),
+    ('Enviar cambios al repositorio remoto (forzado)', 'push', ('remote_name', 'branch'), {'force': True},
+     _standard_result, False)
+)
+
+_PULL_WORKFLOW_SPEC = (
+    ('Obtener cambios del repositorio remoto', 'pull', ('remote_name', 'branch'), {}, _standard_result, False),
+)
+
+
 class GitController:
     """
     Controlador para operaciones Git.
@@ -48,7 +144,7 @@ class GitController:
         else:
             return True, f"Carpeta '{folder_path}' seleccionada correctamente."
     
-    def get_new_repository_workflow(self, repo_url: str, commit_message: str) -> List[Dict[str, Any]]:
+    def get_new_repository_workflow(self, repo_url: str, commit_message: str) -> List[WorkflowStep]:
         """
         Obtiene el flujo de trabajo para un nuevo repositorio.
         
@@ -57,57 +153,19 @@ class GitController:
             commit_message (str): Mensaje para el commit inicial.
             
         Returns:
-            List[Dict[str, Any]]: Lista de pasos del flujo de trabajo.
+            List[WorkflowStep]: Lista de pasos del flujo de trabajo.
         """
-        # Formatear la URL del repositorio
-        formatted_url = format_git_url(repo_url)
+        # Valores variables de los pasos: URL formateada, rama predeterminada y mensaje de commit
+        values = {
+            'remote_url': format_git_url(repo_url),
+            'remote_name': 'origin',
+            'branch': get_default_branch_name(),
+            'commit_message': commit_message
+        }
         
-        # Obtener el nombre de la rama predeterminada
-        branch_name = get_default_branch_name()
-        
-        # Definir el flujo de trabajo
-        workflow = [
-            {
-                'name': 'Inicializar repositorio Git',
-                'function': self.repository.init_repository,
-                'args': [],
-                'kwargs': {}
-            },
-            {
-                'name': 'Crear archivo .gitignore',
-                'function': self.repository.create_gitignore,
-                'args': [],
-                'kwargs': {'template': 'Python'}
-            },
-            {
-                'name': 'Añadir archivos al área de preparación',
-                'function': self.repository.add_all_files,
-                'args': [],
-                'kwargs': {}
-            },
-            {
-                'name': 'Realizar commit inicial',
-                'function': self.repository.commit,
-                'args': [commit_message],
-                'kwargs': {}
-            },
-            {
-                'name': 'Añadir repositorio remoto',
-                'function': self.repository.add_remote,
-                'args': [formatted_url],
-                'kwargs': {'remote_name': 'origin'}
-            },
-            {
-                'name': 'Enviar cambios al repositorio remoto',
-                'function': self.repository.push,
-                'args': [],
-                'kwargs': {'remote_name': 'origin', 'branch': branch_name}
-            }
-        ]
-        
-        return workflow
+        return self._build_workflow(_NEW_WORKFLOW_SPEC, values)
     
-    def get_existing_repository_workflow(self, repo_url: str, overwrite_remote: bool = False) -> List[Dict[str, Any]]:
+    def get_existing_repository_workflow(self, repo_url: str, overwrite_remote: bool = False) -> List[WorkflowStep]:
         """
         Obtiene el flujo de trabajo para un repositorio existente.
         
@@ -116,84 +174,58 @@ class GitController:
             overwrite_remote (bool): Si es True, sobrescribe el contenido remoto con el local.
             
         Returns:
-            List[Dict[str, Any]]: Lista de pasos del flujo de trabajo.
+            List[WorkflowStep]: Lista de pasos del flujo de trabajo.
         """
-        # Formatear la URL del repositorio
-        formatted_url = format_git_url(repo_url)
-        
-        # Obtener el nombre de la rama predeterminada
-        branch_name = get_default_branch_name()
+        # Valores variables de los pasos: URL formateada y rama predeterminada
+        values = {
+            'remote_url': format_git_url(repo_url),
+            'remote_name': 'origin',
+            'branch': get_default_branch_name(),
+            'commit_message': 'Commit inicial para sobrescribir contenido remoto'
+        }
         
         # Definir el flujo de trabajo básico (inicialización y configuración remota)
-        workflow = [
-            {
-                'name': 'Inicializar repositorio Git',
-                'function': self.repository.init_repository,
-                'args': [],
-                'kwargs': {}
-            },
-            {
-                'name': 'Añadir repositorio remoto',
-                'function': self.repository.add_remote,
-                'args': [formatted_url],
-                'kwargs': {'remote_name': 'origin'}
-            },
-            {
-                'name': 'Verificar contenido del repositorio remoto',
-                'function': self.repository.check_remote_content,
-                'args': [],
-                'kwargs': {'remote_name': 'origin'}
-            }
-        ]
+        workflow = self._build_workflow(_EXISTING_WORKFLOW_SPEC, values)
         
-        # Si el usuario eligió sobrescribir el contenido remoto, añadir pasos para push
+        # Si el usuario eligió sobrescribir el contenido remoto, añadir pasos para push;
+        # en caso contrario, añadir paso para obtener cambios del repositorio remoto
         if overwrite_remote:
-            # Verificar si hay cambios en el repositorio antes de intentar hacer commit
-            workflow.append({
-                'name': 'Verificar cambios en el repositorio',
-                'function': self.repository.has_any_changes,
-                'args': [],
-                'kwargs': {}
-            })
-            
-            # Añadir pasos para sobrescribir el contenido remoto
-            workflow.extend([
-                {
-                    'name': 'Añadir archivos al área de preparación',
-                    'function': self.repository.add_all_files,
-                    'args': [],
-                    'kwargs': {}
-                },
-                {
-                    'name': 'Realizar commit inicial',
-                    'function': self.repository.commit,
-                    'args': ['Commit inicial para sobrescribir contenido remoto'],
-                    'kwargs': {}
-                },
-                {
-                    'name': 'Enviar cambios al repositorio remoto (forzado)',
-                    'function': self.repository.push,
-                    'args': [],
-                    'kwargs': {'remote_name': 'origin', 'branch': branch_name, 'force': True}
-                }
-            ])
+            workflow.extend(self._build_workflow(_OVERWRITE_WORKFLOW_SPEC, values))
         else:
-            # Añadir paso para obtener cambios del repositorio remoto
-            workflow.append({
-                'name': 'Obtener cambios del repositorio remoto',
-                'function': self.repository.pull,
-                'args': [],
-                'kwargs': {'remote_name': 'origin', 'branch': branch_name}
-            })
+            workflow.extend(self._build_workflow(_PULL_WORKFLOW_SPEC, values))
         
         return workflow
     
-    def execute_workflow(self, workflow: List[Dict[str, Any]], progress_callback: Optional[Callable[[int, str], None]] = None) -> List[Dict[str, Any]]:
+    def _build_workflow(self, spec: Tuple[Tuple[str, str, Tuple[str, ...], Dict[str, Any], Callable, bool], ...],
+                        values: Dict[str, Any]) -> List[WorkflowStep]:
+        """
+        Construye la lista de pasos de un flujo de trabajo a partir de su especificación.
+        
+        Args:
+            spec: Especificación del flujo de trabajo (ver _NEW_WORKFLOW_SPEC).
+            values (Dict[str, Any]): Valores para los argumentos variables de los pasos.
+            
+        Returns:
+            List[WorkflowStep]: Lista de pasos del flujo de trabajo.
+        """
+        return [
+            WorkflowStep(
+                name=name,
+                function=getattr(self.repository, method_name),
+                args=tuple(values[key] for key in arg_keys),
+                kwargs=kwargs,
+                result_handler=result_handler,
+                skip_without_changes=skip_without_changes
+            )
+            for name, method_name, arg_keys, kwargs, result_handler, skip_without_changes in spec
+        ]
+    
+    def execute_workflow(self, workflow: List[WorkflowStep], progress_callback: Optional[Callable[[int, str], None]] = None) -> List[Dict[str, Any]]:
         """
         Ejecuta un flujo de trabajo.
         
         Args:
-            workflow (List[Dict[str, Any]]): Lista de pasos del flujo de trabajo.
+            workflow (List[WorkflowStep]): Lista de pasos del flujo de trabajo.
             progress_callback (Optional[Callable[[int, str], None]]): Función de callback para informar del progreso.
             
         Returns:
@@ -204,93 +236,79 @@ class GitController:
         
         results = []
         total_steps = len(workflow)
+        # Índices de los pasos que se omiten porque no hay cambios que procesar
+        skip_indices = set()
         
         for i, step in enumerate(workflow):
-            # Calcular el progreso
-            progress = int((i / total_steps) * 100)
+            if i in skip_indices:
+                continue
+            
+            # Calcular el progreso con aritmética entera
+            progress = (i * 100) // total_steps
+            
+            # Informar del inicio del paso (una sola notificación por paso)
+            if progress_callback:
+                progress_callback(progress, f"📋 Ejecutando: {step.name}...")
             
-            # Informar del progreso
+            # Reenviar la salida de los comandos largos (push, pull) a medida que se produce
+            streamed = False
             if progress_callback:
-                progress_callback(progress, f"Ejecutando: {step['name']}...")
+                def output_callback(line: str, progress: int = progress) -> None:
+                    nonlocal streamed
+                    streamed = True
+                    progress_callback(progress, f"  │ {line}")
+                self.repository.output_callback = output_callback
             
             # Ejecutar la función
             try:
-                # Informar del inicio de la operación con más detalle
-                if progress_callback:
-                    progress_callback(progress, f"📋 Iniciando: {step['name']}...")
+                # Convertir el resultado del método según el tipo de paso y guardarlo
+                result = {'name': step.name}
+                result.update(step.result_handler(step.function(*step.args, **step.kwargs)))
+                results.append(result)
+                success = result['success']
+                message = result['message']
                 
-                # Manejar específicamente funciones que devuelven 3 valores
-                if step['name'] == 'Verificar contenido del repositorio remoto':
-                    success, message, remote_info = step['function'](*step['args'], **step['kwargs'])
-                    # Guardar el resultado con la información adicional
-                    results.append({
-                        'name': step['name'],
-                        'success': success,
-                        'message': message,
-                        'remote_info': remote_info
-                    })
-                elif step['name'] == 'Verificar cambios en el repositorio':
-                    success, message, has_changes = step['function'](*step['args'], **step['kwargs'])
-                    # Guardar el resultado con la información de cambios
-                    results.append({
-                        'name': step['name'],
-                        'success': True,  # Siempre marcamos como éxito, ya que es solo informativo
-                        'message': message,
-                        'has_changes': has_changes
-                    })
-                    
+                if result.get('has_changes') is False:
                     # Si no hay cambios, mostrar un mensaje informativo y ajustar el flujo de trabajo
-                    if not has_changes:
-                        if progress_callback:
-                            progress_callback(progress, f"ℹ️ {message} El repositorio está sincronizado con el remoto.")
-                            
-                        # Buscar y saltar los pasos de commit y push si no hay cambios
-                        next_steps_to_skip = []
-                        for j in range(i + 1, len(workflow)):
-                            if workflow[j]['name'] in ['Realizar commit inicial', 'Añadir archivos al área de preparación']:
-                                next_steps_to_skip.append(j)
-                                # Añadir un resultado informativo para estos pasos saltados
-                                results.append({
-                                    'name': workflow[j]['name'],
-                                    'success': True,  # Marcamos como éxito para no interrumpir el flujo
-                                    'message': "Paso omitido: No hay cambios para procesar.",
-                                    'skipped': True
-                                })
-                                
-                                if progress_callback:
-                                    progress_callback(progress, f"ℹ️ {workflow[j]['name']} omitido: No hay cambios para procesar.")
+                    if progress_callback:
+                        progress_callback(progress, f"ℹ️ {message} El repositorio está sincronizado con el remoto.")
                         
-                        # Si hay pasos para saltar, ajustar el índice para continuar con el siguiente paso relevante
-                        if next_steps_to_skip:
-                            i = max(next_steps_to_skip)  # Saltar al último paso que debemos omitir
-                            continue  # Continuar con el siguiente paso después del salto
-                else:
-                    success, message = step['function'](*step['args'], **step['kwargs'])
-                    # Guardar el resultado estándar
-                    results.append({
-                        'name': step['name'],
-                        'success': success,
-                        'message': message
-                    })
+                    # Marcar para omitir los pasos de preparación y commit si no hay cambios
+                    for j in range(i + 1, total_steps):
+                        if workflow[j].skip_without_changes:
+                            skip_indices.add(j)
+                            # Añadir un resultado informativo para estos pasos saltados
+                            results.append({
+                                'name': workflow[j].name,
+                                'success': True,  # Marcamos como éxito para no interrumpir el flujo
+                                'message': "Paso omitido: No hay cambios para procesar.",
+                                'skipped': True
+                            })
+                            
+                            if progress_callback:
+                                progress_callback(progress, f"ℹ️ {workflow[j].name} omitido: No hay cambios para procesar.")
                 
                 # Informar del resultado con formato mejorado
                 if progress_callback:
                     if success:
                         status = "✅ completado"
                         # Mostrar detalles del mensaje en líneas separadas para mejor legibilidad
-                        progress_callback(progress, f"{step['name']} {status}")
-                        if message:
+                        progress_callback(progress, f"{step.name} {status}")
+                        # Si la salida ya se ha mostrado durante la ejecución, no repetirla
+                        if message and not streamed:
                             for line in message.split('\n'):
-                                if line.strip():
-                                    progress_callback(progress, f"  └─ {line.strip()}")
+                                line = line.strip()
+                                if line:
+                                    progress_callback(progress, f"  └─ {line}")
                     else:
                         status = "❌ fallido"
-                        progress_callback(progress, f"{step['name']} {status}: {message}")
+                        progress_callback(progress, f"{step.name} {status}: {message}")
                         # Si hay un mensaje de error detallado, mostrarlo línea por línea
                         if '\n' in message:
                             for line in message.split('\n'):
-                                if line.strip():
-                                    progress_callback(progress, f"  ❌ {line.strip()}")
+                                line = line.strip()
+                                if line:
+                                    progress_callback(progress, f"  ❌ {line}")
                 
                 # Si hay un error, detener el flujo de trabajo
                 if not success:
@@ -298,20 +316,27 @@ class GitController:
             except Exception as e:
                 # Guardar el error
                 results.append({
-                    'name': step['name'],
+                    'name': step.name,
                     'success': False,
                     'message': f"Error: {str(e)}"
                 })
                 
                 # Informar del error
                 if progress_callback:
-                    progress_callback(progress, f"{step['name']} fallido: {str(e)}")
+                    progress_callback(progress, f"{step.name} fallido: {str(e)}")
                 
                 # Detener el flujo de trabajo
                 break
+            finally:
+                self.repository.output_callback = None
+        else:
+            # Informar de la finalización solo si no se ha interrumpido el flujo de trabajo
+            if progress_callback:
+                progress_callback(100, "Proceso completado.")
+            return results
         
-        # Informar de la finalización
+        # El flujo de trabajo se ha interrumpido por un error en el paso actual
         if progress_callback:
-            progress_callback(100, "Proceso completado.")
+            progress_callback(100, f"Proceso abortado en: {step.name}")
         
         return results
\ No newline at end of file
@@ -5,9 +5,257 @@
 Módulo que contiene la clase GitRepository para gestionar operaciones con repositorios Git.
 """
 
+import io
 import os
+import re
+import shlex
+import stat
 import subprocess
-from typing import Tuple, List, Optional, Dict, Any
+import tempfile
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Tuple, List, Optional, Dict, Any, Callable, Iterable, Mapping, NamedTuple, TypeVar
+
+from src.utils.common import get_git_path, STARTUPINFO, CREATIONFLAGS
+
+
+# Número máximo de líneas de salida que se conservan de un comando que se transmite línea a línea
+_MAX_STREAMED_LINES = 2000
+
+# Intervalo mínimo (en segundos) entre dos líneas de progreso de Git ('Receiving objects: 42%')
+_PROGRESS_LINE_INTERVAL = 0.5
+
+
+# Mensajes de Git que indican que la rama solicitada no existe en el remoto.
+# Los comandos se ejecutan con LC_ALL=C para que estos mensajes no dependan del idioma del sistema
+_REMOTE_REF_NOT_FOUND_RE = re.compile(r"couldn't find remote ref|no such ref", re.IGNORECASE)
+
+# Mensaje de 'git remote set-url' cuando el remoto no existe (también con LC_ALL=C)
+_NO_SUCH_REMOTE_RE = re.compile(r"No such remote", re.IGNORECASE)
+
+
+# Resultado de _check_is_git_repo por carpeta, junto con la identidad (fecha de modificación en ns
+# e inodo) de la carpeta y de '.git' cuando se comprobó. Si cualquiera de las dos cambia (se crea,
+# borra o reemplaza '.git', o se reescribe el archivo '.git' de un worktree) el valor se descarta.
+# Se guardan como mucho _IS_REPO_CACHE_MAX carpetas; al llenarse se descarta la más antigua
+_IS_REPO_CACHE: Dict[str, Tuple[Tuple[Any, ...], bool]] = {}
+_IS_REPO_CACHE_MAX = 32
+
+
+# Opciones globales para los comandos de solo lectura: no toman el bloqueo del índice
+# (así no compiten con otro proceso de Git, como un IDE) y leen el índice en paralelo
+_READONLY_PREFIX = ('-c', 'core.preloadindex=true', '--no-optional-locks')
+
+
+# Plantillas de .gitignore (de solo lectura), ya codificadas en UTF-8 para escribirlas directamente en el archivo
+_GITIGNORE_TEMPLATES: Mapping[str, bytes] = MappingProxyType({
+    'python': """
+# Byte-compiled / optimized / DLL files
+__pycache__/
+*.py[cod]
+*$py.class
+
+# C extensions
+*.so
+
+# Distribution / packaging
+.Python
+build/
+develop-eggs/
+dist/
+downloads/
+eggs/
+.eggs/
+lib/
+lib64/
+parts/
+sdist/
+var/
+wheels/
+*.egg-info/
+.installed.cfg
+*.egg
+
+# PyInstaller
+#  Usually these files are written by a python script from a template
+#  before PyInstaller builds the exe, so as to inject date/other infos into it.
+*.manifest
+*.spec
+
+# Installer logs
+pip-log.txt
+pip-delete-this-directory.txt
+
+# Unit test / coverage reports
+htmlcov/
+.tox/
+.coverage
+.coverage.*
+.cache
+nosetests.xml
+coverage.xml
+*.cover
+.hypothesis/
+
+# Translations
+*.mo
+*.pot
+
+# Django stuff:
+*.log
+local_settings.py
+
+# Flask stuff:
+instance/
+.webassets-cache
+
+# Scrapy stuff:
+.scrapy
+
+# Sphinx documentation
+docs/_build/
+
+# PyBuilder
+target/
+
+# Jupyter Notebook
+.ipynb_checkpoints
+
+# pyenv
+.python-version
+
+# celery beat schedule file
+celerybeat-schedule
+
+# SageMath parsed files
+*.sage.py
+
+# Environments
+.env
+.venv
+env/
+venv/
+ENV/
+env.bak/
+venv.bak/
+
+# Spyder project settings
+.spyderproject
+.spyproject
+
+# Rope project settings
+.ropeproject
+
+# mkdocs documentation
+/site
+
+# mypy
+.mypy_cache/
+
+# Local configuration
+.idea/
+.vscode/
+*.swp
+*.swo
+
+# OS generated files
+.DS_Store
+.DS_Store?
+._*
+.Spotlight-V100
+.Trashes
+ehthumbs.db
+Thumbs.db
+""".encode('utf-8')
+})
+
+# Plantilla básica que se usa si no se reconoce la plantilla solicitada
+_DEFAULT_GITIGNORE: bytes = """
+# Archivos generados por el sistema operativo
+.DS_Store
+.DS_Store?
+._*
+.Spotlight-V100
+.Trashes
+ehthumbs.db
+Thumbs.db
+
+# Archivos de configuración del IDE
+.idea/
+.vscode/
+*.swp
+*.swo
+""".encode('utf-8')
+
+
+class RemoteHeads(NamedTuple):
+    """
+    Ramas de un repositorio remoto y rama a la que apunta su HEAD (None si no se conoce).
+    """
+    branches: List[str]
+    head: Optional[str]
+
+
+def _parse_ls_remote_heads(lines: Iterable[bytes]) -> RemoteHeads:
+    """
+    Extrae las ramas y la rama de HEAD de la salida de 'git ls-remote --symref <remoto> HEAD refs/heads/*'.
+    Las líneas se procesan en bytes a medida que llegan y solo se decodifican los nombres de las ramas.
+    
+    Args:
+        lines (Iterable[bytes]): Líneas de la salida, de la forma '<hash>\trefs/heads/<rama>'
+            y, si HEAD apunta a una rama existente, 'ref: refs/heads/<rama>\tHEAD'.
+        
+    Returns:
+        RemoteHeads: Nombres de las ramas en el orden en que aparecen y rama de HEAD.
+    """
+    branches = []
+    head = None
+    for line in lines:
+        if line.startswith(b'ref: '):
+            target, _, name = line[len(b'ref: '):].partition(b'\t')
+            if name.strip() == b'HEAD' and target.startswith(b'refs/heads/'):
+                head = target[len(b'refs/heads/'):].decode('utf-8', errors='replace')
+        elif b'refs/heads/' in line:
+            branches.append(line.rpartition(b'refs/heads/')[2].strip().decode('utf-8', errors='replace'))
+    return RemoteHeads(branches, head)
+
+
+def _git_env() -> Dict[str, str]:
+    """
+    Obtiene las variables de entorno para ejecutar Git.
+    Se fuerzan los mensajes de Git en inglés para poder interpretarlos de forma fiable.
+    
+    Returns:
+        Dict[str, str]: Entorno actual con LC_ALL y LANG fijados a 'C'.
+    """
+    return dict(os.environ, LC_ALL='C', LANG='C')
+
+
+# Tipo del resultado que devuelve un analizador de la salida de Git
+_Parsed = TypeVar('_Parsed')
+
+
+class GitResult(NamedTuple):
+    """
+    Resultado de un comando Git: la salida sin procesar para interpretarla y los datos del mensaje
+    para mostrar, que solo se compone si se consulta (las comprobaciones internas no lo usan).
+    """
+    success: bool
+    stdout: str
+    command: Tuple[str, ...]
+    label: str
+    detail: str
+    
+    @property
+    def message(self) -> str:
+        """
+        Mensaje con el comando ejecutado y su salida o el error.
+        
+        Returns:
+            str: Mensaje de la forma '<etiqueta>: git <argumentos>' seguido de la salida o el error.
+        """
+        return f"{self.label}: {shlex.join(('git', *self.command))}\n{self.detail}"
 
 
 class GitRepository:
@@ -24,7 +272,26 @@ class GitRepository:
             local_path (str): Ruta local de la carpeta que se vinculará con GitHub.
         """
         self.local_path = local_path
-        self.is_git_repo = self._check_is_git_repo()
+        self._is_git_repo = self._check_is_git_repo()
+        # Función opcional que recibe, línea a línea, la salida de los comandos largos (push, pull)
+        self.output_callback: Optional[Callable[[str], None]] = None
+        # Configuración de Git ('git config --list'), cargada la primera vez que se necesita
+        self._config_cache: Optional[Dict[str, str]] = None
+        # Remotos configurados (nombre -> URL) y si hay reglas 'url.<base>.insteadOf', obtenidos
+        # de la configuración en caché y descartados junto con ella
+        self._remotes_cache: Optional[Dict[str, Optional[str]]] = None
+        self._has_url_rewrites = False
+    
+    @property
+    def is_git_repo(self) -> bool:
+        """
+        Indica si la carpeta es un repositorio Git.
+        Se comprueba al crear el objeto y se actualiza en init_repository, sin volver a consultar el disco.
+        
+        Returns:
+            bool: True si la carpeta es un repositorio Git, False en caso contrario.
+        """
+        return self._is_git_repo
     
     def _check_is_git_repo(self) -> bool:
         """
@@ -33,55 +300,220 @@ class GitRepository:
         Returns:
             bool: True si la carpeta ya es un repositorio Git, False en caso contrario.
         """
-        git_dir = os.path.join(self.local_path, '.git')
-        return os.path.exists(git_dir) and os.path.isdir(git_dir)
+        try:
+            folder_st = os.stat(self.local_path)
+        except OSError:
+            return False
+        
+        # Una sola llamada a stat en lugar de comprobar por separado si existe y si es un directorio.
+        # En un worktree o un submódulo '.git' es un archivo que apunta al directorio real del repositorio
+        git_path = os.path.join(self.local_path, '.git')
+        try:
+            git_st: Optional[os.stat_result] = os.stat(git_path)
+        except OSError:
+            git_st = None
+        
+        # Reutilizar el resultado si ni la carpeta ni '.git' han cambiado desde la última comprobación
+        key = (
+            folder_st.st_mtime_ns, folder_st.st_ino,
+            git_st.st_mtime_ns if git_st else None, git_st.st_ino if git_st else None
+        )
+        cached = _IS_REPO_CACHE.get(self.local_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        
+        if git_st is None:
+            is_repo = False
+        else:
+            is_repo = stat.S_ISDIR(git_st.st_mode) or (
+                stat.S_ISREG(git_st.st_mode) and self._is_valid_gitdir_file(git_path)
+            )
+        
+        _IS_REPO_CACHE.pop(self.local_path, None)
+        if len(_IS_REPO_CACHE) >= _IS_REPO_CACHE_MAX:
+            # Descartar la carpeta comprobada hace más tiempo (los diccionarios mantienen el orden de inserción)
+            del _IS_REPO_CACHE[next(iter(_IS_REPO_CACHE))]
+        _IS_REPO_CACHE[self.local_path] = (key, is_repo)
+        return is_repo
     
-    def _run_git_command(self, command: List[str]) -> Tuple[bool, str]:
+    def _is_valid_gitdir_file(self, git_path: str) -> bool:
         """
-        Ejecuta un comando Git y devuelve el resultado.
+        Comprueba que un archivo '.git' (worktree o submódulo) apunta a un directorio existente.
+        
+        Args:
+            git_path (str): Ruta del archivo '.git'.
+            
+        Returns:
+            bool: True si el archivo contiene 'gitdir: <ruta>' y esa ruta es un directorio.
+        """
+        try:
+            with open(git_path, 'r', encoding='utf-8') as f:
+                content = f.readline().strip()
+        except (OSError, UnicodeDecodeError):
+            return False
+        
+        prefix, _, gitdir = content.partition(':')
+        if prefix != 'gitdir' or not gitdir.strip():
+            return False
+        # La ruta puede ser relativa a la carpeta que contiene el archivo '.git'
+        return os.path.isdir(os.path.join(self.local_path, gitdir.strip()))
+    
+    def _run_git_command(self, command: List[str],
+                         line_callback: Optional[Callable[[str], None]] = None,
+                         capture_stdout: bool = True, readonly: bool = False) -> Tuple[bool, str]:
+        """
+        Ejecuta un comando Git y devuelve el resultado en forma de mensaje.
         
         Args:
             command (List[str]): Lista con el comando Git y sus argumentos.
+            line_callback (Optional[Callable[[str], None]]): Si se indica, la salida del comando
+                se transmite línea a línea a esta función mientras se ejecuta.
+            capture_stdout (bool): Si es False, la salida estándar se descarta.
+            readonly (bool): Si es True, el comando se ejecuta sin tomar bloqueos opcionales.
             
         Returns:
             Tuple[bool, str]: Tupla con un booleano que indica si el comando se ejecutó correctamente
                              y un string con la salida o el error.
         """
+        result = self._run_git(command, line_callback, capture_stdout, readonly)
+        return result.success, result.message
+    
+    def _run_git(self, command: List[str],
+                 line_callback: Optional[Callable[[str], None]] = None,
+                 capture_stdout: bool = True, readonly: bool = False) -> GitResult:
+        """
+        Ejecuta un comando Git y devuelve el resultado.
+        
+        Args:
+            command (List[str]): Lista con el comando Git y sus argumentos.
+            line_callback (Optional[Callable[[str], None]]): Si se indica, la salida del comando
+                se transmite línea a línea a esta función mientras se ejecuta.
+            capture_stdout (bool): Si es False, la salida estándar se descarta (solo importan
+                el código de salida y los errores) y no se incluye en el mensaje.
+            readonly (bool): Si es True, se anteponen las opciones de _READONLY_PREFIX para que el
+                comando no tome el bloqueo del índice. Solo para comandos que no modifican el repositorio.
+            
+        Returns:
+            GitResult: Resultado del comando, con la salida estándar sin procesar y el mensaje
+                       (comando ejecutado y salida, o el error).
+        """
+        # El comando se guarda en el resultado y solo se convierte en texto si se pide el mensaje
+        command = tuple(command)
+        
         try:
-            # Preparar el comando completo con 'git' al inicio
-            full_command = ['git'] + command
+            # Preparar el comando completo con la ruta del ejecutable de Git al inicio
+            # (las opciones de solo lectura no se muestran en el mensaje)
+            prefix = _READONLY_PREFIX if readonly else ()
+            full_command = (get_git_path() or 'git', *prefix, *command)
             
-            # Crear un string con el comando completo para el log
-            cmd_str = ' '.join(full_command)
+            env = _git_env()
             
-            # Ejecutar el comando en la carpeta del repositorio sin mostrar ventana de comandos
-            startupinfo = None
-            if os.name == 'nt':  # Solo en Windows
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = 0  # SW_HIDE
+            if line_callback is not None:
+                return self._stream_git_command(full_command, command, env, line_callback)
             
+            # Ejecutar el comando en la carpeta del repositorio sin mostrar ventana de comandos.
+            # La salida se obtiene en bytes y solo se decodifica el flujo que se va a usar;
+            # Git escribe en UTF-8 independientemente de la codificación de la consola
             result = subprocess.run(
                 full_command,
                 cwd=self.local_path,
-                capture_output=True,
-                text=True,
-                check=True,
-                startupinfo=startupinfo
+                stdout=subprocess.PIPE if capture_stdout else subprocess.DEVNULL,
+                stderr=subprocess.PIPE,
+                env=env,
+                startupinfo=STARTUPINFO,
+                creationflags=CREATIONFLAGS
             )
             
-            # Formatear la salida para incluir el comando ejecutado
-            output = f"Comando: {cmd_str}\n{result.stdout.strip()}"
-            return True, output
-        except subprocess.CalledProcessError as e:
-            # Formatear el error para incluir el comando ejecutado
-            cmd_str = ' '.join(['git'] + command)
-            error = f"Error al ejecutar: {cmd_str}\n{e.stderr.strip()}"
-            return False, error
+            # Un código de salida distinto de cero es un resultado habitual (p. ej. 'git diff --quiet'),
+            # así que se comprueba directamente en lugar de lanzar una excepción
+            if result.returncode != 0:
+                error = result.stderr.decode('utf-8', errors='replace').strip()
+                return GitResult(False, "", command, "Error al ejecutar", error)
+            
+            stdout = result.stdout.decode('utf-8', errors='replace') if capture_stdout else ""
+            return GitResult(True, stdout, command, "Comando", stdout.strip())
         except Exception as e:
-            cmd_str = ' '.join(['git'] + command)
-            error = f"Excepción al ejecutar: {cmd_str}\n{str(e)}"
-            return False, error
+            return GitResult(False, "", command, "Excepción al ejecutar", str(e))
+    
+    def _parse_git_stdout(self, command: List[str],
+                          parser: Callable[[Iterable[bytes]], _Parsed]) -> Optional[_Parsed]:
+        """
+        Ejecuta un comando Git de solo lectura y pasa su salida estándar a un analizador línea a línea,
+        en bytes y a medida que se produce, sin acumular la salida completa en memoria.
+        
+        Args:
+            command (List[str]): Lista con el comando Git y sus argumentos.
+            parser (Callable[[Iterable[bytes]], _Parsed]): Función que recibe las líneas de la salida
+                y devuelve el resultado del análisis.
+            
+        Returns:
+            Optional[_Parsed]: Resultado del análisis, o None si el comando falla.
+        """
+        try:
+            # Los errores no se usan, así que stderr se descarta para no bloquear el proceso
+            with subprocess.Popen(
+                (get_git_path() or 'git', *_READONLY_PREFIX, *command),
+                cwd=self.local_path,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                env=_git_env(),
+                startupinfo=STARTUPINFO,
+                creationflags=CREATIONFLAGS
+            ) as process:
+                parsed = parser(process.stdout)
+        except OSError:
+            return None
+        return parsed if process.returncode == 0 else None
+    
+    def _stream_git_command(self, full_command: Tuple[str, ...], command: Tuple[str, ...],
+                            env: Dict[str, str], line_callback: Callable[[str], None]) -> GitResult:
+        """
+        Ejecuta un comando Git transmitiendo su salida (stdout y stderr combinados) línea a línea.
+        Solo se conservan las últimas líneas de la salida para el mensaje de resultado.
+        
+        Las líneas de progreso que Git sobrescribe terminando en '\r' se transmiten como mucho
+        cada _PROGRESS_LINE_INTERVAL segundos y no se conservan en el mensaje de resultado.
+        
+        Args:
+            full_command (Tuple[str, ...]): Comando completo, incluyendo el ejecutable de Git.
+            command (Tuple[str, ...]): Argumentos del comando, para el mensaje de resultado.
+            env (Dict[str, str]): Variables de entorno del proceso.
+            line_callback (Callable[[str], None]): Función que recibe cada línea de salida.
+            
+        Returns:
+            GitResult: Resultado del comando.
+        """
+        output = deque(maxlen=_MAX_STREAMED_LINES)
+        with subprocess.Popen(
+            full_command,
+            cwd=self.local_path,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            env=env,
+            startupinfo=STARTUPINFO,
+            creationflags=CREATIONFLAGS
+        ) as process:
+            # Con newline='' se separan las líneas por '\n' y '\r' sin traducir el final de línea,
+            # lo que permite distinguir las líneas de progreso
+            reader = io.TextIOWrapper(process.stdout, encoding='utf-8', errors='replace', newline='')
+            last_progress_time = 0.0
+            for raw_line in reader:
+                line = raw_line.rstrip()
+                if not line:
+                    continue
+                if raw_line.endswith('\r'):
+                    now = time.monotonic()
+                    if now - last_progress_time >= _PROGRESS_LINE_INTERVAL:
+                        last_progress_time = now
+                        line_callback(line)
+                    continue
+                output.append(line)
+                line_callback(line)
+        
+        text = '\n'.join(output)
+        if process.returncode != 0:
+            return GitResult(False, "", command, "Error al ejecutar", text)
+        return GitResult(True, text, command, "Comando", text)
     
     def init_repository(self) -> Tuple[bool, str]:
         """
@@ -93,12 +525,168 @@ class GitRepository:
         if self.is_git_repo:
             return True, "La carpeta ya es un repositorio Git."
         
-        success, message = self._run_git_command(['init'])
+        success, message = self._run_git_command(['init'], capture_stdout=False)
         if success:
-            self.is_git_repo = True
+            self._is_git_repo = True
+            _IS_REPO_CACHE.pop(self.local_path, None)
             return True, "Repositorio Git inicializado correctamente."
         return False, f"Error al inicializar el repositorio: {message}"
     
+    def _load_config(self) -> Dict[str, str]:
+        """
+        Obtiene la configuración de Git con una sola llamada a 'git config --list',
+        reutilizada hasta la siguiente llamada a invalidate_config_cache().
+        
+        Returns:
+            Dict[str, str]: Diccionario con las claves de configuración y sus valores.
+        """
+        if self._config_cache is not None:
+            return self._config_cache
+        
+        result = self._run_git(['config', '--list', '-z'], readonly=True)
+        if not result.success:
+            return {}
+        
+        # Con -z cada entrada termina en '\0' y la clave se separa del valor con '\n';
+        # si una clave aparece varias veces prevalece la última, igual que con 'git config --get'
+        config = {}
+        for entry in result.stdout.split('\0'):
+            if entry:
+                key, _, value = entry.partition('\n')
+                config[key] = value
+        
+        self._config_cache = config
+        return config
+    
+    def invalidate_config_cache(self) -> None:
+        """
+        Descarta la configuración de Git guardada en caché.
+        """
+        self._config_cache = None
+        self._remotes_cache = None
+    
+    def _load_remotes(self) -> Dict[str, Optional[str]]:
+        """
+        Obtiene los remotos configurados a partir de la configuración en caché
+        (claves 'remote.<nombre>.<variable>'), sin ejecutar 'git remote'.
+        Se calculan una sola vez por cada carga de la configuración.
+        
+        Returns:
+            Dict[str, Optional[str]]: URL configurada de cada remoto (None si no tiene), por nombre.
+        """
+        if self._remotes_cache is not None:
+            return self._remotes_cache
+        
+        remotes: Dict[str, Optional[str]] = {}
+        has_url_rewrites = False
+        for key, value in self._load_config().items():
+            if key.startswith('remote.'):
+                # El nombre del remoto puede contener puntos; la variable es lo que sigue al último
+                name, _, variable = key[len('remote.'):].rpartition('.')
+                if name:
+                    if variable == 'url':
+                        remotes[name] = value
+                    else:
+                        remotes.setdefault(name, None)
+            elif key.startswith('url.'):
+                has_url_rewrites = True
+        
+        self._remotes_cache = remotes
+        self._has_url_rewrites = has_url_rewrites
+        return remotes
+    
+    def _list_remotes(self) -> List[str]:
+        """
+        Obtiene los nombres de los remotos configurados.
+        
+        Returns:
+            List[str]: Nombres de los remotos (vacía si no se pueden obtener).
+        """
+        return list(self._load_remotes())
+    
+    def _has_remote(self, remote_name: str) -> bool:
+        """
+        Indica si el remoto está configurado. Si no aparece en la configuración en caché, esta
+        se vuelve a cargar una vez por si el remoto se ha añadido fuera de la aplicación.
+        
+        Args:
+            remote_name (str): Nombre del remoto.
+            
+        Returns:
+            bool: True si el remoto existe, False en caso contrario.
+        """
+        if remote_name in self._load_remotes():
+            return True
+        self.invalidate_config_cache()
+        return remote_name in self._load_remotes()
+    
+    def _get_remote_url(self, remote_name: str) -> Optional[str]:
+        """
+        Obtiene la URL de un remoto a partir de la configuración en caché. Solo si hay reglas
+        'url.<base>.insteadOf' se consulta a 'git remote get-url', que es quien las aplica.
+        
+        Args:
+            remote_name (str): Nombre del remoto.
+            
+        Returns:
+            Optional[str]: URL del remoto o None si no tiene ninguna.
+        """
+        url = self._load_remotes().get(remote_name)
+        if url is not None and self._has_url_rewrites:
+            result = self._run_git(['remote', 'get-url', remote_name], readonly=True)
+            url = result.stdout.strip() if result.success else url
+        return url
+    
+    def _list_remote_heads(self, remote_name: str) -> Optional[RemoteHeads]:
+        """
+        Obtiene las ramas de un remoto y la rama de su HEAD con una sola llamada a 'git ls-remote'.
+        No se guardan en caché: el remoto puede cambiar en cualquier momento desde otro equipo.
+        
+        Args:
+            remote_name (str): Nombre del remoto.
+            
+        Returns:
+            Optional[RemoteHeads]: Ramas (vacías si el remoto está vacío) y rama de HEAD,
+                                   o None si no se puede acceder al remoto.
+        """
+        # Con --symref y el patrón HEAD, la misma consulta indica también la rama predeterminada
+        return self._parse_git_stdout(['ls-remote', '--symref', remote_name, 'HEAD', 'refs/heads/*'],
+                                      _parse_ls_remote_heads)
+    
+    def _remote_branch_exists(self, remote_name: str, branch: str) -> Optional[bool]:
+        """
+        Comprueba si existe una rama en el remoto consultando solo esa referencia
+        ('git ls-remote --exit-code'), sin listar las demás ramas.
+        
+        Args:
+            remote_name (str): Nombre del remoto.
+            branch (str): Nombre de la rama.
+            
+        Returns:
+            Optional[bool]: True si la rama existe, False si no existe, o None si no se puede
+                            acceder al remoto.
+        """
+        try:
+            result = subprocess.run(
+                (get_git_path() or 'git', *_READONLY_PREFIX,
+                 'ls-remote', '--exit-code', remote_name, f'refs/heads/{branch}'),
+                cwd=self.local_path,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=_git_env(),
+                startupinfo=STARTUPINFO,
+                creationflags=CREATIONFLAGS
+            )
+        except OSError:
+            return None
+        
+        # Con --exit-code, Git termina con el código 2 si la referencia no existe en el remoto
+        if result.returncode == 0:
+            return True
+        if result.returncode == 2:
+            return False
+        return None
+    
     def add_remote(self, remote_url: str, remote_name: str = 'origin') -> Tuple[bool, str]:
         """
         Añade un repositorio remoto.
@@ -113,14 +701,16 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero."
         
-        # Verificar si ya existe el remoto
-        success, remotes = self._run_git_command(['remote'])
-        if success and remote_name in remotes.split():
-            # Si existe, actualizar la URL
-            return self._run_git_command(['remote', 'set-url', remote_name, remote_url])
-        else:
-            # Si no existe, añadirlo
-            return self._run_git_command(['remote', 'add', remote_name, remote_url])
+        # La configuración de remotos cambia, así que se descarta la configuración en caché
+        self.invalidate_config_cache()
+        
+        # Intentar actualizar la URL del remoto y, solo si Git indica que el remoto no existe, añadirlo.
+        # Evita consultar antes la lista de remotos con otro proceso; cualquier otro error
+        # (p. ej. la configuración bloqueada) se devuelve tal cual
+        success, message = self._run_git_command(['remote', 'set-url', remote_name, remote_url], capture_stdout=False)
+        if success or not _NO_SUCH_REMOTE_RE.search(message):
+            return success, message
+        return self._run_git_command(['remote', 'add', remote_name, remote_url], capture_stdout=False)
     
     def add_all_files(self) -> Tuple[bool, str]:
         """
@@ -132,7 +722,7 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero."
         
-        return self._run_git_command(['add', '.'])
+        return self._run_git_command(['add', '.'], capture_stdout=False)
     
     def check_git_config(self) -> Tuple[bool, str, Dict[str, Any]]:
         """
@@ -147,15 +737,10 @@ class GitRepository:
             'is_configured': False
         }
         
-        # Verificar user.name
-        success, output = self._run_git_command(['config', '--get', 'user.name'])
-        if success and output.strip() != "":
-            config_info['user.name'] = output.replace("Comando: git config --get user.name\n", "").strip()
-        
-        # Verificar user.email
-        success, output = self._run_git_command(['config', '--get', 'user.email'])
-        if success and output.strip() != "":
-            config_info['user.email'] = output.replace("Comando: git config --get user.email\n", "").strip()
+        # Obtener user.name y user.email de la configuración cargada una sola vez
+        config = self._load_config()
+        config_info['user.name'] = config.get('user.name') or None
+        config_info['user.email'] = config.get('user.email') or None
         
         # Determinar si está configurado
         config_info['is_configured'] = config_info['user.name'] is not None and config_info['user.email'] is not None
@@ -163,6 +748,9 @@ class GitRepository:
         if config_info['is_configured']:
             return True, f"Configuración de Git: Usuario '{config_info['user.name']}' <{config_info['user.email']}>", config_info
         else:
+            # Volver a cargar la configuración en la próxima comprobación, por si el usuario la completa
+            self.invalidate_config_cache()
+            
             missing = []
             if config_info['user.name'] is None:
                 missing.append("user.name")
@@ -171,6 +759,38 @@ class GitRepository:
             
             return False, f"Configuración de Git incompleta. Falta: {', '.join(missing)}", config_info
     
+    def _scan_changes(self) -> Tuple[bool, str, Tuple[bool, bool, bool]]:
+        """
+        Obtiene con una sola llamada a 'git status' qué tipos de cambios hay en el repositorio.
+        
+        Returns:
+            Tuple[bool, str, Tuple[bool, bool, bool]]: Resultado de la operación, mensaje de error
+                (vacío si no lo hay) y tupla que indica si hay cambios preparados, cambios sin
+                preparar y archivos sin seguimiento.
+        """
+        result = self._run_git(['status', '--porcelain=v2', '-z', '--untracked-files=normal'], readonly=True)
+        if not result.success:
+            return False, result.message, (False, False, False)
+        
+        # Cada entrada tiene la forma '1 XY ...' (cambio), '2 XY ...' (renombrado, seguida de otra
+        # entrada con la ruta original), 'u XY ...' (conflicto) o '? ruta' (sin seguimiento).
+        # X es el estado en el área de preparación, Y el del directorio de trabajo y '.' indica sin cambios
+        has_staged = has_unstaged = has_untracked = False
+        entries = iter(result.stdout.split('\0'))
+        for entry in entries:
+            kind = entry[:1]
+            if kind == '?':
+                has_untracked = True
+            elif kind in ('1', '2', 'u'):
+                if entry[2] != '.':
+                    has_staged = True
+                if entry[3] != '.':
+                    has_unstaged = True
+                if kind == '2':
+                    next(entries, None)
+        
+        return True, "", (has_staged, has_unstaged, has_untracked)
+    
     def has_staged_changes(self) -> Tuple[bool, str, bool]:
         """
         Verifica si hay cambios en el área de preparación (staging) listos para commit.
@@ -181,11 +801,9 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero.", False
         
-        # Ejecutar git diff --cached para ver si hay cambios en staging
-        success, output = self._run_git_command(['diff', '--cached', '--quiet'])
-        
-        # Si el comando falla, significa que hay cambios en staging
-        has_changes = not success
+        success, error, (has_changes, _, _) = self._scan_changes()
+        if not success:
+            return False, error, False
         
         if has_changes:
             return True, "Hay cambios en el área de preparación listos para commit.", True
@@ -202,11 +820,9 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero.", False
         
-        # Ejecutar git diff para ver si hay cambios sin preparar
-        success, output = self._run_git_command(['diff', '--quiet'])
-        
-        # Si el comando falla, significa que hay cambios sin preparar
-        has_changes = not success
+        success, error, (_, has_changes, _) = self._scan_changes()
+        if not success:
+            return False, error, False
         
         if has_changes:
             return True, "Hay cambios sin preparar en el repositorio.", True
@@ -223,19 +839,9 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero.", False
         
-        # Verificar cambios preparados
-        staged_success, staged_msg, has_staged = self.has_staged_changes()
-        if not staged_success:
-            return False, staged_msg, False
-        
-        # Verificar cambios sin preparar
-        unstaged_success, unstaged_msg, has_unstaged = self.has_unstaged_changes()
-        if not unstaged_success:
-            return False, unstaged_msg, False
-        
-        # Verificar si hay archivos sin seguimiento
-        success, output = self._run_git_command(['ls-files', '--others', '--exclude-standard', '--error-unmatch', '*'])
-        has_untracked = success
+        success, error, (has_staged, has_unstaged, has_untracked) = self._scan_changes()
+        if not success:
+            return False, error, False
         
         # Determinar si hay algún tipo de cambio
         has_any_changes = has_staged or has_unstaged or has_untracked
@@ -265,20 +871,19 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero."
         
-        # Verificar si hay cambios para hacer commit
-        success, status_msg, has_changes = self.has_staged_changes()
+        # Verificar con una sola llamada a 'git status' si hay cambios para hacer commit
+        success, error, (has_staged, has_unstaged, has_untracked) = self._scan_changes()
         if not success:
-            return False, status_msg
+            return False, error
         
-        if not has_changes:
-            # Si no hay cambios preparados, verificar si hay otros cambios sin preparar
-            any_success, any_msg, has_any = self.has_any_changes()
-            if any_success and has_any:
+        if not has_staged:
+            # Si no hay cambios preparados, indicar si hay otros cambios sin preparar
+            if has_unstaged or has_untracked:
                 return False, "No hay cambios preparados para hacer commit, pero hay cambios sin preparar. Usa 'git add .' para preparar todos los cambios."
             else:
                 return False, "No hay cambios para hacer commit. El repositorio está sincronizado con el remoto."
         
-        # Verificar si la configuración de usuario está establecida
+        # Verificar si la configuración de usuario está establecida (se lee de la caché de configuración)
         config_success, config_msg, config_info = self.check_git_config()
         if not config_success:
             return False, f"No se puede hacer commit: {config_msg}. Configura tu usuario de Git con 'git config --global user.name \"Tu Nombre\"' y 'git config --global user.email \"tu@email.com\"'."
@@ -304,9 +909,12 @@ class GitRepository:
         command = ['push', '-u']
         if force:
             command.append('--force')
+        # Pedir a Git que informe del progreso de la transferencia si se va a mostrar
+        if self.output_callback:
+            command.append('--progress')
         command.extend([remote_name, branch])
         
-        return self._run_git_command(command)
+        return self._run_git_command(command, self.output_callback)
     
     def diagnose_remote_ref_error(self, remote_name: str = 'origin', branch: str = 'main') -> Tuple[bool, str, Dict[str, Any]]:
         """
@@ -326,28 +934,25 @@ class GitRepository:
             'is_remote_empty': False,
             'remote_exists': False,
             'remote_url': None,
-            'available_branches': []
+            'available_branches': [],
+            'default_branch': None
         }
         
-        # Verificar si el remoto existe
-        success, remotes_output = self._run_git_command(['remote'])
-        if not success or remote_name not in remotes_output.split():
+        # Verificar si el remoto existe (se consulta la configuración en caché), antes de
+        # lanzar ninguna consulta de red
+        if not self._has_remote(remote_name):
             diagnosis['possible_causes'].append('El remoto especificado no existe')
             diagnosis['recommended_actions'].append(f'Añadir el remoto con: git remote add {remote_name} <url>')
             return False, f"El remoto '{remote_name}' no existe en este repositorio.", diagnosis
         
         diagnosis['remote_exists'] = True
         
-        # Obtener la URL del remoto
-        success, remote_url_output = self._run_git_command(['remote', 'get-url', remote_name])
-        if success:
-            remote_url = remote_url_output.strip().split('\n')[-1]
-            diagnosis['remote_url'] = remote_url
+        diagnosis['remote_url'] = self._get_remote_url(remote_name)
         
         # Intentar listar las ramas remotas
-        success, ls_remote_output = self._run_git_command(['ls-remote', '--heads', remote_name])
+        remote_heads = self._list_remote_heads(remote_name)
         
-        if not success:
+        if remote_heads is None:
             # Si falla, podría ser porque el repositorio remoto no existe o no es accesible
             diagnosis['possible_causes'].append('El repositorio remoto no existe o no es accesible')
             diagnosis['possible_causes'].append('Problemas de conectividad o autenticación')
@@ -355,34 +960,32 @@ class GitRepository:
             diagnosis['recommended_actions'].append('Verificar credenciales de autenticación')
             return False, f"No se puede acceder al remoto '{remote_name}'. Verifica que existe y tienes acceso.", diagnosis
         
-        # Si ls-remote no devuelve nada, el repositorio remoto está vacío
-        if not ls_remote_output or ls_remote_output.strip() == f"Comando: git ls-remote --heads {remote_name}":
+        available_branches = remote_heads.branches
+        diagnosis['default_branch'] = remote_heads.head
+        
+        # Si ls-remote no devuelve ninguna rama, el repositorio remoto está vacío
+        if not available_branches:
             diagnosis['is_remote_empty'] = True
             diagnosis['possible_causes'].append('El repositorio remoto está vacío')
             diagnosis['recommended_actions'].append(f'Hacer push con: git push -u {remote_name} {branch}')
             return True, f"El repositorio remoto '{remote_name}' está vacío. No hay ramas disponibles.", diagnosis
         
-        # Extraer las ramas disponibles del output de ls-remote
-        available_branches = []
-        for line in ls_remote_output.split('\n'):
-            if line.startswith('Comando:'):
-                continue
-            if 'refs/heads/' in line:
-                branch_name = line.split('refs/heads/')[-1].strip()
-                available_branches.append(branch_name)
-        
         diagnosis['available_branches'] = available_branches
+        # Conjunto para las comprobaciones de pertenencia; la lista conserva el orden para los mensajes
+        branch_set = set(available_branches)
         
         # Si la rama especificada no está en las ramas disponibles
-        if branch not in available_branches:
+        if branch not in branch_set:
             diagnosis['possible_causes'].append(f"La rama '{branch}' no existe en el repositorio remoto")
             
             # Sugerir una rama alternativa si hay alguna disponible
             if available_branches:
-                # Buscar 'main' o 'master' primero, luego cualquier otra
-                if 'main' in available_branches:
+                # Usar la rama de HEAD del remoto; si no se conoce, buscar 'main' o 'master' y luego cualquier otra
+                if remote_heads.head in branch_set:
+                    diagnosis['alternative_branch'] = remote_heads.head
+                elif 'main' in branch_set:
                     diagnosis['alternative_branch'] = 'main'
-                elif 'master' in available_branches:
+                elif 'master' in branch_set:
                     diagnosis['alternative_branch'] = 'master'
                 else:
                     diagnosis['alternative_branch'] = available_branches[0]
@@ -415,47 +1018,37 @@ class GitRepository:
         }
         
         # Verificar si el remoto existe
-        success, remotes_output = self._run_git_command(['remote'])
-        if not success or remote_name not in remotes_output.split():
+        if not self._has_remote(remote_name):
             return False, f"El remoto '{remote_name}' no existe en este repositorio.", result_info
         
         # Intentar listar las ramas remotas
-        success, ls_remote_output = self._run_git_command(['ls-remote', '--heads', remote_name])
+        remote_heads = self._list_remote_heads(remote_name)
         
-        if not success:
+        if remote_heads is None:
             # Si falla, podría ser porque el repositorio remoto no existe o no es accesible
             return False, f"No se puede acceder al remoto '{remote_name}'. Verifica que existe y tienes acceso.", result_info
         
-        # Si ls-remote no devuelve nada o solo devuelve el comando, el repositorio remoto está vacío
-        if not ls_remote_output or ls_remote_output.strip() == f"Comando: git ls-remote --heads {remote_name}":
-            return True, f"El repositorio remoto '{remote_name}' está vacío.", result_info
+        available_branches = remote_heads.branches
         
-        # Extraer las ramas disponibles del output de ls-remote
-        available_branches = []
-        for line in ls_remote_output.split('\n'):
-            if line.startswith('Comando:'):
-                continue
-            if 'refs/heads/' in line:
-                branch_name = line.split('refs/heads/')[-1].strip()
-                available_branches.append(branch_name)
-        
-        if available_branches:
-            result_info['has_content'] = True
-            result_info['available_branches'] = available_branches
-            
-            # Determinar la rama predeterminada (main o master)
-            if 'main' in available_branches:
-                result_info['default_branch'] = 'main'
-            elif 'master' in available_branches:
-                result_info['default_branch'] = 'master'
-            else:
-                result_info['default_branch'] = available_branches[0]
-            
-            return True, f"El repositorio remoto tiene contenido. Ramas disponibles: {', '.join(available_branches)}", result_info
+        # Si ls-remote no devuelve ninguna rama, el repositorio remoto está vacío
+        if not available_branches:
+            return True, f"El repositorio remoto '{remote_name}' está vacío.", result_info
         
-        # Si llegamos aquí, el repositorio tiene algún contenido pero no pudimos determinar las ramas
         result_info['has_content'] = True
-        return True, "El repositorio remoto tiene contenido, pero no se pudieron determinar las ramas.", result_info
+        result_info['available_branches'] = available_branches
+        branch_set = set(available_branches)
+        
+        # Determinar la rama predeterminada: la de HEAD en el remoto o, si no se conoce, main o master
+        if remote_heads.head in branch_set:
+            result_info['default_branch'] = remote_heads.head
+        elif 'main' in branch_set:
+            result_info['default_branch'] = 'main'
+        elif 'master' in branch_set:
+            result_info['default_branch'] = 'master'
+        else:
+            result_info['default_branch'] = available_branches[0]
+        
+        return True, f"El repositorio remoto tiene contenido. Ramas disponibles: {', '.join(available_branches)}", result_info
     
     def get_status(self) -> Tuple[bool, str]:
         """
@@ -467,7 +1060,7 @@ class GitRepository:
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero."
         
-        return self._run_git_command(['status'])
+        return self._run_git_command(['status', '--untracked-files=normal'], readonly=True)
     
     def create_gitignore(self, template: str = 'Python') -> Tuple[bool, str]:
         """
@@ -484,155 +1077,49 @@ class GitRepository:
         
         gitignore_path = os.path.join(self.local_path, '.gitignore')
         
-        # Verificar si ya existe un archivo .gitignore
+        # Caso habitual: si ya existe, no se escribe ningún archivo
         if os.path.exists(gitignore_path):
             return True, "El archivo .gitignore ya existe."
         
-        # Crear un archivo .gitignore básico para Python
-        if template.lower() == 'python':
-            gitignore_content = """
-# Byte-compiled / optimized / DLL files
-__pycache__/
-*.py[cod]
-*$py.class
-
-# C extensions
-*.so
-
-# Distribution / packaging
-.Python
-build/
-develop-eggs/
-dist/
-downloads/
-eggs/
-.eggs/
-lib/
-lib64/
-parts/
-sdist/
-var/
-wheels/
-*.egg-info/
-.installed.cfg
-*.egg
-
-# PyInstaller
-#  Usually these files are written by a python script from a template
-#  before PyInstaller builds the exe, so as to inject date/other infos into it.
-*.manifest
-*.spec
-
-# Installer logs
-pip-log.txt
-pip-delete-this-directory.txt
-
-# Unit test / coverage reports
-htmlcov/
-.tox/
-.coverage
-.coverage.*
-.cache
-nosetests.xml
-coverage.xml
-*.cover
-.hypothesis/
-
-# Translations
-*.mo
-*.pot
-
-# Django stuff:
-*.log
-local_settings.py
-
-# Flask stuff:
-instance/
-.webassets-cache
-
-# Scrapy stuff:
-.scrapy
-
-# Sphinx documentation
-docs/_build/
-
-# PyBuilder
-target/
-
-# Jupyter Notebook
-.ipynb_checkpoints
-
-# pyenv
-.python-version
-
-# celery beat schedule file
-celerybeat-schedule
-
-# SageMath parsed files
-*.sage.py
-
-# Environments
-.env
-.venv
-env/
-venv/
-ENV/
-env.bak/
-venv.bak/
-
-# Spyder project settings
-.spyderproject
-.spyproject
-
-# Rope project settings
-.ropeproject
-
-# mkdocs documentation
-/site
-
-# mypy
-.mypy_cache/
-
-# Local configuration
-.idea/
-.vscode/
-*.swp
-*.swo
-
-# OS generated files
-.DS_Store
-.DS_Store?
-._*
-.Spotlight-V100
-.Trashes
-ehthumbs.db
-Thumbs.db
-"""
-        else:
-            # Si no se reconoce la plantilla, crear un .gitignore básico
-            gitignore_content = """
-# Archivos generados por el sistema operativo
-.DS_Store
-.DS_Store?
-._*
-.Spotlight-V100
-.Trashes
-ehthumbs.db
-Thumbs.db
-
-# Archivos de configuración del IDE
-.idea/
-.vscode/
-*.swp
-*.swo
-"""
+        # Usar la plantilla solicitada o, si no se reconoce, un .gitignore básico
+        gitignore_content = _GITIGNORE_TEMPLATES.get(template.lower(), _DEFAULT_GITIGNORE)
         
+        # Escribir en un archivo temporal propio (con nombre único, para no pisar ningún archivo del
+        # usuario) y publicarlo después como .gitignore de forma atómica, para no dejar un
+        # .gitignore incompleto si la escritura se interrumpe
         try:
-            with open(gitignore_path, 'w', encoding='utf-8') as f:
-                f.write(gitignore_content)
+            fd, temp_path = tempfile.mkstemp(dir=self.local_path, prefix='.gitignore.', suffix='.tmp')
+        except OSError as e:
+            return False, f"Error al crear el archivo .gitignore: {str(e)}"
+        
+        try:
+            try:
+                os.write(fd, gitignore_content)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+            # mkstemp crea el archivo solo legible por el usuario; .gitignore usa los permisos habituales
+            os.chmod(temp_path, 0o644)
+            
+            # El enlace falla si se ha creado un .gitignore mientras tanto, sin sobrescribirlo
+            try:
+                os.link(temp_path, gitignore_path)
+            except FileExistsError:
+                return True, "El archivo .gitignore ya existe."
+            except OSError:
+                # Sistemas de archivos sin enlaces duros (p. ej. FAT)
+                if os.path.exists(gitignore_path):
+                    return True, "El archivo .gitignore ya existe."
+                os.replace(temp_path, gitignore_path)
             return True, f"Archivo .gitignore creado con plantilla '{template}'."
         except Exception as e:
             return False, f"Error al crear el archivo .gitignore: {str(e)}"
+        finally:
+            # Eliminar solo el archivo temporal creado aquí (ya no existe si se ha renombrado)
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
     
     def pull(self, remote_name: str = 'origin', branch: str = 'main') -> Tuple[bool, str]:
         """
@@ -648,4 +1135,35 @@ Thumbs.db
         if not self.is_git_repo:
             return False, "La carpeta no es un repositorio Git. Inicialízalo primero."
         
-        return self._run_git_command(['pull', remote_name, branch])
\ No newline at end of file
+        # Pedir a Git que informe del progreso de la transferencia si se va a mostrar
+        options = ['--progress'] if self.output_callback else []
+        
+        # Comprobar antes si la rama existe en el remoto, para no lanzar un pull que va a fallar.
+        # Solo se consulta esa referencia; las demás ramas se listan únicamente si no existe
+        if not os.environ.get('INICIALIZAR_NO_GIT_LS_REMOTE_FAST_PATH'):
+            if self._remote_branch_exists(remote_name, branch) is False:
+                message = f"La rama '{branch}' no existe en el remoto '{remote_name}'."
+                return self._missing_branch_error(remote_name, branch, message)
+        
+        success, message = self._run_git_command(['pull', *options, remote_name, branch], self.output_callback)
+        if success or not _REMOTE_REF_NOT_FOUND_RE.search(message):
+            return success, message
+        
+        return self._missing_branch_error(remote_name, branch, message)
+    
+    def _missing_branch_error(self, remote_name: str, branch: str, message: str) -> Tuple[bool, str]:
+        """
+        Completa el error de una rama que no existe en el remoto con su diagnóstico, que indica
+        las ramas disponibles y cuál usar en su lugar. No se obtienen cambios de otra rama sin
+        que el usuario la elija.
+        
+        Args:
+            remote_name (str): Nombre del remoto.
+            branch (str): Nombre de la rama que no existe en el remoto.
+            message (str): Mensaje del error original.
+            
+        Returns:
+            Tuple[bool, str]: Resultado de la operación (siempre False) y mensaje.
+        """
+        _, diagnosis_message, diagnosis = self.diagnose_remote_ref_error(remote_name, branch)
+        return False, '\n'.join([message, diagnosis_message, *diagnosis['recommended_actions']])
\ No newline at end of file
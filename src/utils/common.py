@@ -9,10 +9,43 @@ Contiene funciones y clases de utilidad que pueden ser usadas en diferentes part
 import os
 import sys
 import platform
+import shutil
 import subprocess
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
 
 
+# Configuración para lanzar procesos sin mostrar ventana de comandos en Windows (None en otros
+# sistemas). Se crea una única vez y la comparten todos los módulos que ejecutan Git o GitHub CLI
+STARTUPINFO = None
+if os.name == 'nt':
+    STARTUPINFO = subprocess.STARTUPINFO()
+    STARTUPINFO.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+    STARTUPINFO.wShowWindow = 0  # SW_HIDE
+
+# Indicadores de creación de proceso que acompañan a STARTUPINFO: con CREATE_NO_WINDOW los
+# procesos de consola ni siquiera llegan a crear su ventana (0 en otros sistemas)
+CREATIONFLAGS = subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+
+
+# Prefijos con los que format_git_url considera completa una URL
+_GIT_URL_PREFIXES = ('https://', 'git@')
+
+
+@lru_cache(maxsize=None)
+def get_git_path() -> Optional[str]:
+    """
+    Obtiene la ruta completa del ejecutable de Git (solo se busca la primera vez).
+    Usar la ruta completa evita que el sistema busque 'git' en el PATH cada vez que se lanza un comando.
+    
+    Returns:
+        Optional[str]: Ruta completa del ejecutable o None si no se encuentra.
+    """
+    # Buscar el ejecutable en el PATH sin lanzar ningún proceso
+    return shutil.which('git')
+
+
+@lru_cache(maxsize=None)
 def is_git_installed() -> bool:
     """
     Verifica si Git está instalado en el sistema.
@@ -20,25 +53,7 @@ def is_git_installed() -> bool:
     Returns:
         bool: True si Git está instalado, False en caso contrario.
     """
-    try:
-        # Configurar para ocultar la ventana de comandos en Windows
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0  # SW_HIDE
-            
-        # Ejecutar el comando 'git --version' para verificar si Git está instalado
-        subprocess.run(
-            ['git', '--version'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            check=True,
-            startupinfo=startupinfo
-        )
-        return True
-    except (subprocess.SubprocessError, FileNotFoundError):
-        return False
+    return get_git_path() is not None
 
 
 def get_system_info() -> Dict[str, str]:
@@ -70,6 +85,7 @@ def validate_folder_path(folder_path: str) -> bool:
     return os.path.exists(folder_path) and os.path.isdir(folder_path)
 
 
+@lru_cache(maxsize=8)
 def format_git_url(url: str) -> str:
     """
     Formatea una URL de GitHub para asegurar que sea válida.
@@ -80,6 +96,11 @@ def format_git_url(url: str) -> str:
     Returns:
         str: URL formateada.
     """
+    # Caso habitual: la URL ya está completa (p. ej. 'https://github.com/usuario/repo.git'),
+    # sin espacios al principio ni al final, y se devuelve tal cual
+    if url.endswith('.git') and url.startswith(_GIT_URL_PREFIXES):
+        return url
+    
     # Eliminar espacios en blanco
     url = url.strip()
     
@@ -90,7 +111,7 @@ def format_git_url(url: str) -> str:
         url = url[:-1] + '.git'
     
     # Asegurar que la URL comienza con https:// o git@
-    if not (url.startswith('https://') or url.startswith('git@')):
+    if not url.startswith(_GIT_URL_PREFIXES):
         if '@' in url and ':' in url:
             # Parece ser una URL SSH sin el prefijo git@
             url = 'git@' + url
@@ -101,29 +122,24 @@ def format_git_url(url: str) -> str:
     return url
 
 
+@lru_cache(maxsize=None)
 def get_default_branch_name() -> str:
     """
-    Obtiene el nombre de la rama predeterminada configurada en Git.
+    Obtiene el nombre de la rama predeterminada configurada en Git (se consulta una vez por sesión).
     
     Returns:
         str: Nombre de la rama predeterminada (por defecto 'main').
     """
     try:
-        # Configurar para ocultar la ventana de comandos en Windows
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0  # SW_HIDE
-            
         # Intentar obtener la rama predeterminada configurada en Git
         result = subprocess.run(
-            ['git', 'config', '--get', 'init.defaultBranch'],
+            (get_git_path() or 'git', 'config', '--get', 'init.defaultBranch'),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             check=True,
-            startupinfo=startupinfo
+            startupinfo=STARTUPINFO,
+            creationflags=CREATIONFLAGS
         )
         branch = result.stdout.strip()
         return branch if branch else 'main'
@@ -140,21 +156,15 @@ def get_git_username() -> str:
         str: Nombre de usuario de Git o cadena vacía si no se encuentra.
     """
     try:
-        # Configurar para ocultar la ventana de comandos en Windows
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0  # SW_HIDE
-            
         # Intentar obtener el nombre de usuario configurado en Git
         result = subprocess.run(
-            ['git', 'config', '--get', 'user.name'],
+            (get_git_path() or 'git', 'config', '--get', 'user.name'),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
             check=True,
-            startupinfo=startupinfo
+            startupinfo=STARTUPINFO,
+            creationflags=CREATIONFLAGS
         )
         return result.stdout.strip()
     except (subprocess.SubprocessError, FileNotFoundError):
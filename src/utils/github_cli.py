@@ -6,55 +6,47 @@ Módulo de utilidades para interactuar con GitHub CLI.
 Contiene funciones para verificar la instalación, autenticación y obtener información del usuario.
 """
 
+import json
+import shutil
 import subprocess
 import os
+import time
+from functools import lru_cache
 from typing import Dict, Any, Tuple, Optional
 
+from src.utils.common import STARTUPINFO, CREATIONFLAGS
 
+
+# Ubicaciones habituales de GitHub CLI en Windows cuando no está en el PATH
+_COMMON_GH_LOCATIONS = (
+    os.path.join(os.environ.get('ProgramFiles', r'C:\Program Files'), 'GitHub CLI', 'gh.exe'),
+    os.path.join(os.environ.get('ProgramFiles(x86)', r'C:\Program Files (x86)'), 'GitHub CLI', 'gh.exe'),
+    os.path.join(os.environ.get('LOCALAPPDATA', ''), 'GitHub CLI', 'gh.exe')
+)
+
+
+@lru_cache(maxsize=None)
 def get_gh_cli_path() -> Optional[str]:
     """
-    Obtiene la ruta completa del ejecutable de GitHub CLI.
+    Obtiene la ruta completa del ejecutable de GitHub CLI, memorizada tras la primera búsqueda.
     
     Returns:
         Optional[str]: Ruta completa del ejecutable o None si no se encuentra.
     """
-    # Primero intentamos encontrarlo en el PATH
-    try:
-        # Configurar para ocultar la ventana de comandos en Windows
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0  # SW_HIDE
-            
-        result = subprocess.run(
-            ['where', 'gh'] if os.name == 'nt' else ['which', 'gh'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True,
-            startupinfo=startupinfo
-        )
-        path = result.stdout.strip().split('\n')[0]
-        if path and os.path.isfile(path):
-            return path
-    except (subprocess.SubprocessError, FileNotFoundError):
-        pass
+    # Primero intentamos encontrarlo en el PATH, sin lanzar ningún proceso
+    path = shutil.which('gh')
+    if path:
+        return path
     
     # Si no está en el PATH, verificamos ubicaciones comunes de instalación
-    common_locations = [
-        os.path.join(os.environ.get('ProgramFiles', 'C:\Program Files'), 'GitHub CLI', 'gh.exe'),
-        os.path.join(os.environ.get('ProgramFiles(x86)', 'C:\Program Files (x86)'), 'GitHub CLI', 'gh.exe'),
-        os.path.join(os.environ.get('LOCALAPPDATA', ''), 'GitHub CLI', 'gh.exe')
-    ]
-    
-    for location in common_locations:
+    for location in _COMMON_GH_LOCATIONS:
         if os.path.isfile(location):
             return location
             
     return None
 
 
+@lru_cache(maxsize=None)
 def is_gh_cli_installed() -> bool:
     """
     Verifica si GitHub CLI está instalado en el sistema.
@@ -66,89 +58,103 @@ def is_gh_cli_installed() -> bool:
     return get_gh_cli_path() is not None
 
 
-def is_gh_authenticated() -> bool:
+# Tiempo (en segundos) durante el que se reutiliza la información del usuario autenticado
+_GH_STATE_TTL = 60.0
+
+# Información del usuario autenticado en GitHub CLI, junto con el momento en que se obtuvo.
+# Solo se guarda tras una consulta correcta, de modo que un fallo se vuelve a comprobar.
+_gh_user_state: Optional[Tuple[float, Dict[str, Any]]] = None
+
+
+def get_gh_state() -> Optional[Dict[str, Any]]:
     """
-    Verifica si el usuario está autenticado en GitHub CLI.
+    Obtiene el estado de GitHub CLI con una única llamada a 'gh api user'.
+    Una respuesta correcta indica a la vez que GitHub CLI está instalado, que el usuario
+    está autenticado y proporciona su información, por lo que se guarda en caché durante
+    _GH_STATE_TTL segundos (así se detecta si la sesión se cierra fuera de la aplicación).
     
     Returns:
-        bool: True si el usuario está autenticado, False en caso contrario.
+        Optional[Dict[str, Any]]: Diccionario con información del usuario o None si no está autenticado.
     """
-    if not is_gh_cli_installed():
-        return False
+    global _gh_user_state
+    now = time.monotonic()
+    if _gh_user_state is not None and now - _gh_user_state[0] < _GH_STATE_TTL:
+        return _gh_user_state[1]
     
     # Obtener la ruta del ejecutable de GitHub CLI
     gh_path = get_gh_cli_path()
     if not gh_path:
-        return False
+        return None
         
     try:
-        # Configurar para ocultar la ventana de comandos en Windows
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0  # SW_HIDE
-            
-        # Ejecutar el comando 'gh auth status' para verificar si el usuario está autenticado
+        # Ejecutar el comando 'gh api user' para obtener solo los campos que se utilizan;
+        # si el usuario no está autenticado, el comando termina con error
         result = subprocess.run(
-            [gh_path, 'auth', 'status'],
+            (gh_path, 'api', 'user', '--jq', '{login, name, email, avatar_url, html_url}'),
             stdout=subprocess.PIPE,
             stderr=subprocess.PIPE,
             text=True,
-            startupinfo=startupinfo
+            timeout=10,
+            startupinfo=STARTUPINFO,
+            creationflags=CREATIONFLAGS
         )
-        # Si el comando se ejecuta correctamente y no hay errores, el usuario está autenticado
-        return result.returncode == 0
-    except subprocess.SubprocessError:
-        return False
+        if result.returncode != 0:
+            return None
+        
+        # Convertir la salida JSON a un diccionario
+        user_info = json.loads(result.stdout)
+    except (subprocess.SubprocessError, OSError, json.JSONDecodeError):
+        return None
+    
+    state = {
+        'username': user_info.get('login'),
+        'name': user_info.get('name'),
+        'email': user_info.get('email'),
+        'avatar_url': user_info.get('avatar_url'),
+        'html_url': user_info.get('html_url')
+    }
+    _gh_user_state = (now, state)
+    return state
+
+
+def is_gh_authenticated() -> bool:
+    """
+    Verifica si el usuario está autenticado en GitHub CLI.
+    
+    Returns:
+        bool: True si el usuario está autenticado, False en caso contrario.
+    """
+    return get_gh_state() is not None
 
 
 def get_gh_user_info() -> Optional[Dict[str, Any]]:
     """
     Obtiene información del usuario autenticado en GitHub CLI.
+    Se reutiliza el último estado consultado; refresh_gh_user_info() lo renueva.
     
     Returns:
         Optional[Dict[str, Any]]: Diccionario con información del usuario o None si no está autenticado.
     """
-    if not is_gh_authenticated():
-        return None
-    
-    # Obtener la ruta del ejecutable de GitHub CLI
-    gh_path = get_gh_cli_path()
-    if not gh_path:
-        return None
-        
-    try:
-        # Configurar para ocultar la ventana de comandos en Windows
-        startupinfo = None
-        if os.name == 'nt':
-            startupinfo = subprocess.STARTUPINFO()
-            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-            startupinfo.wShowWindow = 0  # SW_HIDE
-            
-        # Ejecutar el comando 'gh api user' para obtener información del usuario
-        result = subprocess.run(
-            [gh_path, 'api', 'user'],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True,
-            startupinfo=startupinfo
-        )
-        
-        # Convertir la salida JSON a un diccionario
-        import json
-        user_info = json.loads(result.stdout)
-        
-        return {
-            'username': user_info.get('login'),
-            'name': user_info.get('name'),
-            'email': user_info.get('email'),
-            'avatar_url': user_info.get('avatar_url'),
-            'html_url': user_info.get('html_url')
-        }
-    except (subprocess.SubprocessError, json.JSONDecodeError):
-        return None
+    return get_gh_state()
+
+
+def refresh_gh_user_info() -> None:
+    """
+    Descarta la información del usuario guardada en caché.
+    La siguiente llamada a get_gh_user_info() volverá a consultar GitHub CLI.
+    """
+    global _gh_user_state
+    _gh_user_state = None
+
+
+def invalidate_gh_cache() -> None:
+    """
+    Descarta toda la información de GitHub CLI guardada en caché (ruta del ejecutable,
+    instalación y usuario autenticado), por ejemplo tras iniciar o cerrar sesión.
+    """
+    get_gh_cli_path.cache_clear()
+    is_gh_cli_installed.cache_clear()
+    refresh_gh_user_info()
 
 
 def build_github_repo_url(username: str, repo_name: str) -> str:
@@ -175,5 +181,4 @@ def extract_repo_name_from_path(folder_path: str) -> str:
     Returns:
         str: Nombre del repositorio.
     """
-    import os
     return os.path.basename(folder_path)
\ No newline at end of file
@@ -6,18 +6,24 @@ Módulo que contiene la pantalla de carga inicial de la aplicación.
 Implementa una interfaz gráfica que muestra el progreso de las verificaciones iniciales.
 """
 
-import sys
 import os
-from typing import List, Dict, Any, Optional, Callable
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import List, Dict, Any
 
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QPushButton, 
-    QLabel, QProgressBar, QApplication, QCheckBox,
-    QFrame, QSizePolicy
+    QLabel, QProgressBar, QCheckBox,
+    QFrame, QSizePolicy, QWidget
 )
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot, QSize, QTimer
-from PyQt5.QtGui import QFont, QIcon, QMovie
-from PyQt5.QtSvg import QSvgWidget
+from PyQt5.QtCore import Qt, QObject, QThread, pyqtSignal, pyqtSlot, QSize, QTimer, QRectF
+from PyQt5.QtGui import QFont, QPainter
+
+
+# Ruta del SVG animado que muestra el spinner de carga
+_SPINNER_SVG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "resources", "loading_spinner.svg")
+
+# Tamaño (en píxeles) con el que se dibuja el SVG del spinner
+_SPINNER_SVG_SIZE = 50
 
 
 class CheckItem(QFrame):
@@ -44,7 +50,9 @@ class CheckItem(QFrame):
         self.checkbox.setEnabled(False)  # Deshabilitado para que el usuario no pueda modificarlo
         layout.addWidget(self.checkbox)
         
-        # Crear la etiqueta
+        # Crear la etiqueta, guardando su texto original para añadirle después el resultado
+        self._base_text = text
+        self._state = None
         self.label = QLabel(text)
         layout.addWidget(self.label)
         
@@ -59,24 +67,76 @@ class CheckItem(QFrame):
             checked (bool): True para marcar como completado, False en caso contrario.
             success (bool): True si la verificación fue exitosa, False si falló.
         """
+        # No volver a aplicar el mismo estado: cambiar la hoja de estilos obliga a Qt a repintar la etiqueta
+        state = (checked, success)
+        if state == self._state:
+            return
+        self._state = state
+        
         self.checkbox.setChecked(checked)
         
-        if checked:
-            if success:
-                self.label.setStyleSheet("color: green; font-weight: bold;")
-                self.label.setText(f"{self.label.text()} ✓")
-            else:
-                self.label.setStyleSheet("color: red; font-weight: bold;")
-                self.label.setText(f"{self.label.text()} ✗")
+        if not checked:
+            self.label.setStyleSheet("")
+            self.label.setText(self._base_text)
+        elif success:
+            self.label.setStyleSheet("color: green; font-weight: bold;")
+            self.label.setText(f"{self._base_text} ✓")
+        else:
+            self.label.setStyleSheet("color: red; font-weight: bold;")
+            self.label.setText(f"{self._base_text} ✗")
 
 
-class LoadingWorker(QThread):
+class SpinnerWidget(QWidget):
+    """
+    Spinner de carga que muestra el SVG animado de los recursos.
+    El propio SVG incluye la animación, por lo que no es necesario rotarlo manualmente.
+    """
+    # Renderizador del SVG compartido por todos los spinners, para leer y analizar el archivo una sola vez
+    _renderer = None
+    
+    def __init__(self, parent=None):
+        """
+        Constructor del componente SpinnerWidget.
+        
+        Args:
+            parent: Widget padre.
+        """
+        super().__init__(parent)
+        self.setFixedSize(QSize(60, 60))  # Aumentar tamaño para mejor visibilidad
+        
+        if SpinnerWidget._renderer is None:
+            # QtSvg solo se carga cuando se crea el primer spinner, no al importar este módulo
+            from PyQt5.QtSvg import QSvgRenderer
+            SpinnerWidget._renderer = QSvgRenderer(_SPINNER_SVG_PATH)
+        
+        # Repintar el widget cada vez que avanza la animación del SVG
+        SpinnerWidget._renderer.repaintNeeded.connect(self.update)
+    
+    def paintEvent(self, event):
+        """
+        Dibuja el SVG centrado en el widget.
+        
+        Args:
+            event: Evento de pintado.
+        """
+        offset = (self.width() - _SPINNER_SVG_SIZE) / 2
+        painter = QPainter(self)
+        self._renderer.render(painter, QRectF(offset, offset, _SPINNER_SVG_SIZE, _SPINNER_SVG_SIZE))
+        painter.end()
+
+
+class LoadingWorker(QObject):
     """
     Clase para ejecutar las verificaciones iniciales en segundo plano.
-    Evita que la interfaz se bloquee durante las verificaciones.
+    Se mueve a un QThread para que la interfaz no se bloquee durante las verificaciones.
     """
     progress_signal = pyqtSignal(str, bool)
-    finished_signal = pyqtSignal(bool, dict)
+    # Resultado global, resultados por verificación e identificador de la verificación crítica
+    # que detuvo el proceso (cadena vacía si no falló ninguna)
+    finished_signal = pyqtSignal(bool, dict, str)
+    # Pide al hilo de la interfaz que ejecute la función de recuperación de una verificación,
+    # ya que puede mostrar diálogos; el resultado se deja en recovery_result
+    recovery_signal = pyqtSignal(str)
     
     def __init__(self, checks: List[Dict[str, Any]]):
         """
@@ -87,59 +147,102 @@ class LoadingWorker(QThread):
         """
         super().__init__()
         self.checks = checks
+        self.recovery_result: Any = None
+    
+    def _collect_result(self, check: Dict[str, Any], future: Future, results: Dict[str, Any]) -> bool:
+        """
+        Obtiene el resultado de una verificación, lo almacena y emite la señal de progreso.
+        
+        Args:
+            check (Dict[str, Any]): Verificación realizada.
+            future (Future): Ejecución en segundo plano de la verificación.
+            results (Dict[str, Any]): Resultados de las verificaciones, por identificador.
+            
+        Returns:
+            bool: True si la verificación fue exitosa, False si falló.
+        """
+        try:
+            # Obtener el resultado de la verificación
+            result = future.result()
+            success = True if result else False
+            
+            # Si la verificación requiere un resultado específico y no coincide, marcar como fallida
+            if 'expected_result' in check and result != check['expected_result']:
+                success = False
+            
+            # Almacenar el resultado
+            results[check['id']] = result
+        except Exception as e:
+            # Si ocurre un error, marcar la verificación como fallida
+            results[check['id']] = str(e)
+            success = False
+        
+        # Emitir señal de progreso
+        self.progress_signal.emit(check['id'], success)
+        return success
     
+    @pyqtSlot()
     def run(self):
         """
         Método que se ejecuta en segundo plano.
         Realiza las verificaciones y emite señales de progreso y finalización.
         """
         all_success = True
+        failed_check_id = ''
         results = {}
         
-        for check in self.checks:
-            try:
-                # Ejecutar la verificación
-                result = check['function'](*check.get('args', []), **check.get('kwargs', {}))
-                success = True if result else False
-                
-                # Si la verificación requiere un resultado específico y no coincide, marcar como fallida
-                if 'expected_result' in check and result != check['expected_result']:
-                    success = False
-                
-                # Almacenar el resultado
-                results[check['id']] = result
+        # Las verificaciones con función de recuperación se ejecutan después y en orden, porque la
+        # recuperación (p. ej. pedir la autenticación) solo tiene sentido si las demás han ido bien
+        parallel = [check for check in self.checks if not callable(check.get('recovery_function'))]
+        serial = [check for check in self.checks if callable(check.get('recovery_function'))]
+        
+        executor = ThreadPoolExecutor(max_workers=max(1, min(8, len(parallel))))
+        
+        # Lanzar a la vez las demás para que se solapen y procesarlas a medida que terminan
+        pending = {
+            executor.submit(check['function'], *check.get('args', []), **check.get('kwargs', {})): check
+            for check in parallel
+        }
+        for future in as_completed(pending):
+            check = pending[future]
+            if not self._collect_result(check, future, results) and check.get('critical', False):
+                # Si la verificación es crítica y falló, terminar las verificaciones
+                all_success = False
+                failed_check_id = check['id']
+                break
+        
+        if all_success:
+            for check in serial:
+                # Solo se lanzan cuando todas las anteriores han ido bien, una tras otra
+                future = executor.submit(check['function'], *check.get('args', []), **check.get('kwargs', {}))
+                if self._collect_result(check, future, results) or not check.get('critical', False):
+                    continue
                 
-                # Emitir señal de progreso
-                self.progress_signal.emit(check['id'], success)
+                # La verificación es crítica y falló: ejecutar su función de recuperación en el hilo
+                # de la interfaz (la señal espera a que termine)
+                all_success = False
+                self.recovery_result = False
+                self.recovery_signal.emit(check['id'])
+                recovery_result = self.recovery_result
+                results[f"{check['id']}_recovery"] = recovery_result
                 
-                # Si la verificación es crítica y falló, marcar todo como fallido
-                if check.get('critical', False) and not success:
-                    all_success = False
-                    
-                    # Si la verificación tiene una función de recuperación, ejecutarla
-                    if 'recovery_function' in check and callable(check['recovery_function']):
-                        recovery_result = check['recovery_function'](*check.get('recovery_args', []), **check.get('recovery_kwargs', {}))
-                        results[f"{check['id']}_recovery"] = recovery_result
-                        
-                        # Si la recuperación fue exitosa, continuar con las verificaciones
-                        if recovery_result:
-                            all_success = True
-                            continue
-                    
-                    # Si no hay función de recuperación o falló, terminar las verificaciones
-                    break
-            except Exception as e:
-                # Si ocurre un error, marcar la verificación como fallida
-                self.progress_signal.emit(check['id'], False)
-                results[check['id']] = str(e)
+                # Si la recuperación fue exitosa, continuar con las verificaciones
+                if recovery_result:
+                    all_success = True
+                    continue
                 
-                # Si la verificación es crítica, marcar todo como fallido
-                if check.get('critical', False):
-                    all_success = False
-                    break
+                # Si la recuperación falló, terminar las verificaciones
+                failed_check_id = check['id']
+                break
+        
+        # Descartar las verificaciones que aún no han empezado y esperar a las que están en curso
+        # (solo las rápidas, sin recuperación), para no dejar hilos vivos al terminar
+        for future in pending:
+            future.cancel()
+        executor.shutdown(wait=True)
         
         # Emitir señal de finalización
-        self.finished_signal.emit(all_success, results)
+        self.finished_signal.emit(all_success, results, failed_check_id)
 
 
 class LoadingScreen(QDialog):
@@ -165,8 +268,18 @@ class LoadingScreen(QDialog):
         
         # Almacenar las verificaciones
         self.checks = checks
+        self._checks_by_id = {check['id']: check for check in checks}
+        # Mensajes de estado de cada verificación (exitosa, fallida), construidos una sola vez
+        self._status_texts = {
+            check['id']: (f"Completado: {check['description']} ✓", f"Fallido: {check['description']} ✗")
+            for check in checks
+        }
         self.check_items = {}
         self.results = {}
+        # Estado de cada verificación completada (True si fue exitosa), sin consultar los checkbox,
+        # y último porcentaje mostrado en la barra de progreso
+        self._check_states: Dict[str, bool] = {}
+        self._last_progress = -1
         self.animation_active = True  # Control para la animación
         
         # Inicializar la interfaz
@@ -175,11 +288,24 @@ class LoadingScreen(QDialog):
         # Mostrar mensaje de inicialización inmediato
         self._show_initializing_message("Iniciando verificaciones...")
         
-        # Procesar eventos para asegurar que la interfaz se actualice inmediatamente
-        QApplication.processEvents()
+        # Las verificaciones se inician en showEvent, cuando la ventana ya es visible
+        self._checks_started = False
+    
+    def showEvent(self, event):
+        """
+        Inicia las verificaciones la primera vez que se muestra la ventana.
+        Se ejecutan en otro hilo, así que no retrasan el primer pintado.
+        La ventana se trae al frente una sola vez; después la mantiene visible WindowStaysOnTopHint.
         
-        # Iniciar las verificaciones después de un breve retraso para asegurar que la UI esté visible
-        QTimer.singleShot(100, self._start_checks)
+        Args:
+            event: Evento de visualización.
+        """
+        super().showEvent(event)
+        if not self._checks_started:
+            self._checks_started = True
+            self.activateWindow()
+            self.raise_()
+            self._start_checks()
     
     def _init_ui(self):
         """
@@ -212,33 +338,6 @@ class LoadingScreen(QDialog):
         animation_container.setAlignment(Qt.AlignCenter)
         animation_container.setSpacing(30)  # Aumentar el espaciado entre elementos para evitar superposiciones
         
-        # Crear un widget personalizado para el spinner que utilice la animación nativa del SVG
-        from PyQt5.QtWidgets import QWidget
-        
-        class SpinnerWidget(QWidget):
-            def __init__(self, parent=None):
-                super().__init__(parent)
-                self.setFixedSize(QSize(60, 60))  # Aumentar tamaño para mejor visibilidad
-                
-                # Obtener la ruta al archivo SVG
-                svg_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 
-                                        "src", "views", "resources", "loading_spinner.svg")
-                
-                # Crear el widget SVG
-                self.svg_widget = QSvgWidget(svg_path)
-                self.svg_widget.setFixedSize(QSize(50, 50))  # Aumentar tamaño del SVG
-                
-                # Crear layout para centrar el SVG
-                layout = QHBoxLayout(self)
-                layout.setContentsMargins(0, 0, 0, 0)
-                layout.setAlignment(Qt.AlignCenter)
-                layout.addWidget(self.svg_widget)
-                self.setLayout(layout)  # Establecer el layout en el widget
-                
-                # El SVG ya tiene animación incorporada, no necesitamos rotarlo manualmente
-                # Solo aplicamos estilos para asegurar que sea visible
-                self.svg_widget.setStyleSheet("background: transparent;")
-        
         # Crear el widget spinner personalizado
         self.spinner_widget = SpinnerWidget(self)
         
@@ -294,9 +393,9 @@ class LoadingScreen(QDialog):
         Args:
             message (str): Mensaje a mostrar.
         """
-        if hasattr(self, 'status_label'):
+        # Cambiar el texto solo si es distinto, para no recalcular la disposición de la etiqueta
+        if hasattr(self, 'status_label') and self.status_label.text() != message:
             self.status_label.setText(message)
-            QApplication.processEvents()
     
     def _start_spinner_animation(self):
         """
@@ -317,15 +416,36 @@ class LoadingScreen(QDialog):
         # Actualizar mensaje
         self._show_initializing_message("Ejecutando verificaciones...")
         
-        # Crear el worker
+        # Crear el worker y moverlo a su propio hilo
+        self._thread = QThread(self)
         self.worker = LoadingWorker(self.checks)
+        self.worker.moveToThread(self._thread)
         
         # Conectar señales
+        self._thread.started.connect(self.worker.run)
         self.worker.progress_signal.connect(self._update_progress)
+        self.worker.recovery_signal.connect(self._run_recovery, Qt.BlockingQueuedConnection)
         self.worker.finished_signal.connect(self._checks_finished)
+        self.worker.finished_signal.connect(self._thread.quit)
         
-        # Iniciar el worker
-        self.worker.start()
+        # Iniciar el hilo
+        self._thread.start()
+    
+    @pyqtSlot(str)
+    def _run_recovery(self, check_id: str):
+        """
+        Ejecuta la función de recuperación de una verificación fallida en el hilo de la interfaz
+        y deja el resultado en el worker, que espera a que termine.
+        
+        Args:
+            check_id (str): Identificador de la verificación.
+        """
+        check = self._checks_by_id[check_id]
+        try:
+            result = check['recovery_function'](*check.get('recovery_args', []), **check.get('recovery_kwargs', {}))
+        except Exception:
+            result = False
+        self.worker.recovery_result = result
     
     @pyqtSlot(str, bool)
     def _update_progress(self, check_id: str, success: bool):
@@ -336,41 +456,41 @@ class LoadingScreen(QDialog):
             check_id (str): Identificador de la verificación.
             success (bool): True si la verificación fue exitosa, False si falló.
         """
-        # Actualizar el elemento del checklist
-        if check_id in self.check_items:
-            self.check_items[check_id].set_checked(True, success)
+        # Ignorar avisos repetidos de una verificación ya mostrada
+        if check_id in self._check_states:
+            return
+        
+        # Suspender el repintado mientras se actualizan el checklist, el estado y la barra de
+        # progreso, para que Qt los pinte juntos en una sola pasada
+        self.setUpdatesEnabled(False)
+        try:
+            self._check_states[check_id] = success
             
-            # Actualizar el mensaje de estado con la verificación actual
-            for check in self.checks:
-                if check['id'] == check_id:
-                    status_text = f"Verificando: {check['description']}"
-                    if success:
-                        status_text = f"Completado: {check['description']} ✓"
-                    else:
-                        status_text = f"Fallido: {check['description']} ✗"
-                    self._show_initializing_message(status_text)
-                    break
+            # Actualizar el elemento del checklist
+            if check_id in self.check_items:
+                self.check_items[check_id].set_checked(True, success)
+                
+                # Actualizar el mensaje de estado con la verificación actual
+                self._show_initializing_message(self._status_texts[check_id][0 if success else 1])
             
-            # Asegurar que la ventana permanezca visible y con foco
-            self.activateWindow()
-            self.raise_()
-        
-        # Actualizar la barra de progreso
-        completed = sum(1 for item in self.check_items.values() if item.checkbox.isChecked())
-        progress = int((completed / len(self.check_items)) * 100)
-        self.progress_bar.setValue(progress)
-        
-        # Procesar eventos para mantener la interfaz responsiva
-        QApplication.processEvents()
+            # Actualizar la barra de progreso solo cuando cambia el porcentaje; las señales del worker
+            # ya llegan por el bucle de eventos, así que no hace falta procesar eventos a mano
+            progress = len(self._check_states) * 100 // len(self.check_items)
+            if progress != self._last_progress:
+                self._last_progress = progress
+                self.progress_bar.setValue(progress)
+        finally:
+            self.setUpdatesEnabled(True)
     
-    @pyqtSlot(bool, dict)
-    def _checks_finished(self, all_success: bool, results: dict):
+    @pyqtSlot(bool, dict, str)
+    def _checks_finished(self, all_success: bool, results: dict, failed_check_id: str):
         """
         Método llamado cuando se completan todas las verificaciones.
         
         Args:
             all_success (bool): True si todas las verificaciones fueron exitosas, False si alguna falló.
             results (dict): Resultados de las verificaciones.
+            failed_check_id (str): Identificador de la verificación crítica que falló (vacío si ninguna).
         """
         # Almacenar los resultados
         self.results = results
@@ -395,12 +515,8 @@ class LoadingScreen(QDialog):
         
         # Si alguna verificación falló, mostrar mensaje y agregar un botón para salir
         if not all_success:
-            # Buscar la primera verificación crítica que falló
-            failed_check = None
-            for check in self.checks:
-                if check.get('critical', False) and not results.get(check['id'], False):
-                    failed_check = check
-                    break
+            # La verificación crítica que detuvo el proceso; las posteriores pueden no haberse recogido
+            failed_check = self._checks_by_id.get(failed_check_id)
             
             # Crear un botón de salir ya que eliminamos el botón continuar
             exit_button = QPushButton("Salir")
@@ -7,7 +7,9 @@ Implementa la interfaz gráfica para seleccionar carpetas y vincularlas con GitH
 """
 
 import os
-from typing import List, Dict, Any, Optional, Callable
+import re
+import subprocess
+from typing import List, Dict, Any, Optional, Callable, Tuple
 
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
@@ -18,8 +20,9 @@ from PyQt5.QtWidgets import (
 from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot, QDir
 from PyQt5.QtGui import QFont, QIcon
 
-from src.controllers.git_controller import GitController
-from src.utils.common import is_git_installed
+from src.controllers.git_controller import GitController, WorkflowStep
+from src.utils.common import is_git_installed, get_git_username, build_github_url, get_git_path, STARTUPINFO, CREATIONFLAGS
+from src.utils.github_cli import get_gh_cli_path, extract_repo_name_from_path, build_github_repo_url
 
 
 class WorkerThread(QThread):
@@ -31,13 +34,13 @@ class WorkerThread(QThread):
     finished_signal = pyqtSignal(list)
     error_signal = pyqtSignal(str)
     
-    def __init__(self, controller: GitController, workflow: List[Dict[str, Any]]):
+    def __init__(self, controller: GitController, workflow: List[WorkflowStep]):
         """
         Constructor de la clase WorkerThread.
         
         Args:
             controller (GitController): Controlador de Git.
-            workflow (List[Dict[str, Any]]): Flujo de trabajo a ejecutar.
+            workflow (List[WorkflowStep]): Flujo de trabajo a ejecutar.
         """
         super().__init__()
         self.controller = controller
@@ -58,6 +61,39 @@ class WorkerThread(QThread):
             self.error_signal.emit(str(e))
 
 
+class TaskThread(QThread):
+    """
+    Clase para ejecutar una única operación en segundo plano y devolver su resultado.
+    Se usa para consultas que pueden tardar (por ejemplo, de red) antes de iniciar un flujo de trabajo.
+    """
+    finished_signal = pyqtSignal(object)
+    error_signal = pyqtSignal(str)
+    
+    def __init__(self, function: Callable, *args, **kwargs):
+        """
+        Constructor de la clase TaskThread.
+        
+        Args:
+            function (Callable): Función a ejecutar.
+            *args: Argumentos posicionales de la función.
+            **kwargs: Argumentos con nombre de la función.
+        """
+        super().__init__()
+        self.function = function
+        self.args = args
+        self.kwargs = kwargs
+    
+    def run(self):
+        """
+        Método que se ejecuta en segundo plano.
+        Ejecuta la función y emite su resultado o el error producido.
+        """
+        try:
+            self.finished_signal.emit(self.function(*self.args, **self.kwargs))
+        except Exception as e:
+            self.error_signal.emit(str(e))
+
+
 class MainWindow(QMainWindow):
     """
     Ventana principal de la aplicación.
@@ -387,44 +423,76 @@ class MainWindow(QMainWindow):
                 return
             self._log_message("✅ Remoto configurado correctamente.")
             
-            # Verificar el contenido del repositorio remoto
-            success, message, remote_info = self.git_controller.repository.check_remote_content()
+            # Verificar el contenido del repositorio remoto en segundo plano, ya que es una consulta de red.
+            # El proceso continúa en _remote_content_checked cuando termina la verificación.
+            self._set_controls_enabled(False)
+            self.remote_check_thread = TaskThread(self.git_controller.repository.check_remote_content)
+            self.remote_check_thread.finished_signal.connect(self._remote_content_checked)
+            self.remote_check_thread.error_signal.connect(self._process_error)
+            self.remote_check_thread.start()
+            return
+        
+        self._confirm_and_run_workflow(workflow)
+    
+    @pyqtSlot(object)
+    def _remote_content_checked(self, result: Tuple[bool, str, Dict[str, Any]]):
+        """
+        Continúa el proceso de vinculación con un repositorio existente
+        una vez verificado el contenido del repositorio remoto.
+        
+        Args:
+            result (Tuple[bool, str, Dict[str, Any]]): Resultado de check_remote_content.
+        """
+        self._set_controls_enabled(True)
+        success, message, remote_info = result
+        repo_url = self.repo_url_input.text()
+        
+        # Variable para controlar si debemos sobrescribir el contenido remoto
+        overwrite_remote = False
+        
+        if success and remote_info['has_content']:
+            # El repositorio remoto tiene contenido, preguntar al usuario qué hacer
+            branches_str = ", ".join(remote_info['available_branches'][:3])
+            if len(remote_info['available_branches']) > 3:
+                branches_str += ", ..."
             
-            # Variable para controlar si debemos sobrescribir el contenido remoto
-            overwrite_remote = False
+            self._log_message(f"⚠️ El repositorio remoto tiene contenido. Ramas disponibles: {branches_str}")
             
-            if success and remote_info['has_content']:
-                # El repositorio remoto tiene contenido, preguntar al usuario qué hacer
-                branches_str = ", ".join(remote_info['available_branches'][:3])
-                if len(remote_info['available_branches']) > 3:
-                    branches_str += ", ..."
-                
-                self._log_message(f"⚠️ El repositorio remoto tiene contenido. Ramas disponibles: {branches_str}")
-                
-                reply = QMessageBox.question(
-                    self,
-                    "Repositorio Remoto con Contenido",
-                    f"El repositorio remoto ya tiene contenido. Ramas disponibles: {branches_str}\n\n"
-                    "¿Deseas sobrescribir el contenido remoto con el contenido local?\n\n"
-                    "- Si eliges 'Sí', se sobrescribirá el contenido remoto con el local.\n"
-                    "- Si eliges 'No', se obtendrán los cambios del remoto y se mezclarán con el local.",
-                    QMessageBox.Yes | QMessageBox.No,
-                    QMessageBox.No
-                )
-                
-                overwrite_remote = (reply == QMessageBox.Yes)
-                
-                if overwrite_remote:
-                    self._log_message("⚠️ Se sobrescribirá el contenido remoto con el local.")
-                else:
-                    self._log_message("ℹ️ Se obtendrán los cambios del remoto y se mezclarán con el local.")
-            elif success and remote_info['is_empty']:
-                self._log_message("ℹ️ El repositorio remoto está vacío.")
-                # Si el repositorio está vacío, podemos tratarlo como un nuevo repositorio
-                overwrite_remote = True
+            reply = QMessageBox.question(
+                self,
+                "Repositorio Remoto con Contenido",
+                f"El repositorio remoto ya tiene contenido. Ramas disponibles: {branches_str}\n\n"
+                "¿Deseas sobrescribir el contenido remoto con el contenido local?\n\n"
+                "- Si eliges 'Sí', se sobrescribirá el contenido remoto con el local.\n"
+                "- Si eliges 'No', se obtendrán los cambios del remoto y se mezclarán con el local.",
+                QMessageBox.Yes | QMessageBox.No,
+                QMessageBox.No
+            )
+            
+            overwrite_remote = (reply == QMessageBox.Yes)
             
-            # Obtener el flujo de trabajo adecuado según la decisión del usuario
-            workflow = self.git_controller.get_existing_repository_workflow(repo_url, overwrite_remote)
+            if overwrite_remote:
+                self._log_message("⚠️ Se sobrescribirá el contenido remoto con el local.")
+            else:
+                self._log_message("ℹ️ Se obtendrán los cambios del remoto y se mezclarán con el local.")
+        elif success:
+            self._log_message("ℹ️ El repositorio remoto está vacío.")
+            # Si el repositorio está vacío, podemos tratarlo como un nuevo repositorio
+            overwrite_remote = True
+        
+        # Obtener el flujo de trabajo adecuado según la decisión del usuario
+        workflow = self.git_controller.get_existing_repository_workflow(repo_url, overwrite_remote)
+        self._confirm_and_run_workflow(workflow)
+    
+    def _confirm_and_run_workflow(self, workflow: List[WorkflowStep]):
+        """
+        Solicita confirmación (si corresponde) y ejecuta el flujo de trabajo en segundo plano.
+        
+        Args:
+            workflow (List[WorkflowStep]): Flujo de trabajo a ejecutar.
+        """
+        folder_path = self.folder_path_input.text()
+        repo_url = self.repo_url_input.text()
         
         # Determinar si debemos mostrar confirmación o proceder directamente
         # Si estamos creando un nuevo repositorio y ya se ha creado exitosamente, no necesitamos confirmación
@@ -473,10 +541,6 @@ class MainWindow(QMainWindow):
         Returns:
             str: URL del repositorio creado o cadena vacía si hubo un error.
         """
-        from src.utils.github_cli import get_gh_cli_path
-        import subprocess
-        import json
-        
         # Obtener la ruta del ejecutable de GitHub CLI
         gh_path = get_gh_cli_path()
         if not gh_path:
@@ -484,7 +548,6 @@ class MainWindow(QMainWindow):
             return ""
         
         # Limpiar el nombre del repositorio (eliminar caracteres no válidos)
-        import re
         clean_repo_name = re.sub(r'[^\w.-]', '-', repo_name)
         
         # Verificar si la carpeta ya es un repositorio Git
@@ -493,22 +556,16 @@ class MainWindow(QMainWindow):
             # Inicializar el repositorio Git local primero
             self._log_message("🔄 Inicializando repositorio Git local...")
             try:
-                # Configurar para ocultar la ventana de comandos en Windows
-                startupinfo = None
-                if os.name == 'nt':
-                    startupinfo = subprocess.STARTUPINFO()
-                    startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                    startupinfo.wShowWindow = 0  # SW_HIDE
-                    
                 # Ejecutar el comando git init y capturar la salida en tiempo real
                 self._log_message("📋 Ejecutando: git init")
                 init_result = subprocess.run(
-                    ['git', 'init'],
+                    (get_git_path() or 'git', 'init'),
                     cwd=folder_path,
                     stdout=subprocess.PIPE,
                     stderr=subprocess.PIPE,
                     text=True,
-                    startupinfo=startupinfo
+                    startupinfo=STARTUPINFO,
+                    creationflags=CREATIONFLAGS
                 )
                 
                 # Mostrar la salida del comando en el log
@@ -545,13 +602,6 @@ class MainWindow(QMainWindow):
         self._log_message(f"🔄 Creando repositorio '{clean_repo_name}' en GitHub...")
         
         try:
-            # Configurar para ocultar la ventana de comandos en Windows
-            startupinfo = None
-            if os.name == 'nt':
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                startupinfo.wShowWindow = 0  # SW_HIDE
-                
             # Crear el repositorio con GitHub CLI
             # Usamos --private por defecto, pero se podría añadir una opción en la interfaz
             command = [gh_path, 'repo', 'create', clean_repo_name, '--private', '--source=.']
@@ -563,7 +613,8 @@ class MainWindow(QMainWindow):
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
-                startupinfo=startupinfo
+                startupinfo=STARTUPINFO,
+                creationflags=CREATIONFLAGS
             )
             
             # Mostrar la salida del comando en el log
@@ -585,7 +636,6 @@ class MainWindow(QMainWindow):
                     # Buscar URLs de GitHub en la salida
                     if "github.com" in line:
                         # Extraer la URL usando expresiones regulares
-                        import re
                         urls = re.findall(r'https?://github\.com/[\w.-]+/[\w.-]+', line)
                         if urls:
                             repo_url = urls[0]
@@ -812,9 +862,6 @@ class MainWindow(QMainWindow):
         Utiliza la información del usuario de GitHub CLI si está disponible.
         Controla la edición del campo de URL según el estado del checkbox.
         """
-        from src.utils.common import get_git_username, build_github_url
-        from src.utils.github_cli import extract_repo_name_from_path, build_github_repo_url
-        
         folder_path = self.folder_path_input.text()
         if not folder_path:
             return